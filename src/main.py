@@ -167,6 +167,9 @@ def main():
         if result.get("updated_config_path"):
             print(f"  💾 Updated config: {result['updated_config_path']}")
         
+        if result.get("action_log_path"):
+            print(f"  📜 Action log: {result['action_log_path']}")
+        
         print()
         sys.exit(0)
     else:
@@ -6,10 +6,12 @@ sequentially using available tools.
 """
 
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel, Field
+import asyncio
 import json
-from ollama import chat, ChatResponse
+import threading
+from itertools import islice
 
 from src.rehosting.schemas import ActionRecord
 from src.rehosting.knowledge_base import KnowledgeBase, get_knowledge_base
@@ -17,6 +19,9 @@ from src.rehosting.tools.config_tools import ConfigToolRegistry
 from src.rehosting.tools.tool_definitions import get_all_tool_schemas, get_tool_definition
 from src.settings import is_verbose, verbose_print
 
+if TYPE_CHECKING:
+    from ollama import ChatResponse
+
 
 class EngineerState(BaseModel):
     """State specific to the Engineer agent (focused context, not shared with planner)."""
@@ -37,6 +42,10 @@ class EngineerState(BaseModel):
         default_factory=list,
         description="Detailed records of all actions taken"
     )
+    placeholder_used: bool = Field(
+        default=False,
+        description="Whether add_environment_variable_placeholder was already called for this plan"
+    )
 
 
 class EngineerAgent:
@@ -59,6 +68,9 @@ class EngineerAgent:
     
     # Available tools for the Engineer (from tool definitions)
     AVAILABLE_TOOLS = get_all_tool_schemas()
+    
+    # Seconds an option waits for the options before it to apply their changes
+    OPTION_TURN_TIMEOUT = 600.0
 
     SYSTEM_PROMPT = """You are an Engineer implementing firmware rehosting config changes.
 
@@ -148,6 +160,10 @@ Output ONLY JSON, no markdown."""
         self.kb = get_knowledge_base(kb_path)
         self.state = EngineerState()
         self.tool_registry = ConfigToolRegistry(project_path)
+        self._state_lock = threading.Lock()
+        # Options reason concurrently but apply their changes in priority order
+        self._apply_turn = threading.Condition()
+        self._next_to_apply = 1
         self.discovery_mode = False  # Track discovery mode
     
     def execute_plan(self, plan: Any, discovery_mode: bool = False) -> Dict[str, Any]:
@@ -165,6 +181,9 @@ Output ONLY JSON, no markdown."""
         - LLM uses specialized DISCOVERY_MODE_PROMPT
         - Option metadata provides variable_name directly
         
+        The same steps are exposed individually (start_plan, execute_option,
+        finish_plan) so the LangGraph workflow can overlap the options' LLM calls.
+        
         Args:
             plan: Plan object from the Planner (with 'options' field)
             discovery_mode: Whether in discovery mode (affects prompts and max_options)
@@ -175,6 +194,35 @@ Output ONLY JSON, no markdown."""
             - "summary": List of execution summaries
             - "success": Boolean indicating overall success
         """
+        sorted_options = self.start_plan(plan, discovery_mode=discovery_mode)
+        
+        results = {
+            "plan_id": plan.id,
+            "total_options": len(sorted_options),
+            "action_records": [],
+            "summary": []
+        }
+        
+        # Execute each option in sequence
+        for i, option in enumerate(sorted_options, 1):
+            outcome = self.execute_option(option, i, len(sorted_options))
+            results["action_records"].append(outcome["action_record"])
+            results["summary"].append(outcome["summary"])
+        
+        results.update(self.finish_plan(results["summary"]))
+        return results
+    
+    def start_plan(self, plan: Any, discovery_mode: bool = False) -> List[Any]:
+        """
+        Reset per-plan state and select the options to execute.
+        
+        Args:
+            plan: Plan object from the Planner (with 'options' field)
+            discovery_mode: Whether in discovery mode (affects prompts and max_options)
+            
+        Returns:
+            Options sorted by priority (critical -> low), limited to max_options
+        """
         self.discovery_mode = discovery_mode
         
         if is_verbose():
@@ -191,6 +239,8 @@ Output ONLY JSON, no markdown."""
         
         # Reset state for new plan
         self.state = EngineerState()
+        with self._apply_turn:
+            self._next_to_apply = 1
         
         # Sort options by priority (critical -> high -> medium -> low)
         priority_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
@@ -209,125 +259,197 @@ Output ONLY JSON, no markdown."""
             print(f"   ⚠️  Limiting to {self.max_options} highest priority options (out of {len(sorted_options)} total)")
             sorted_options = sorted_options[:self.max_options]
         
-        results = {
-            "plan_id": plan.id,
-            "total_options": len(sorted_options),
-            "completed": 0,
-            "failed": 0,
-            "skipped": 0,
-            "action_records": [],
-            "summary": []
-        }
+        return sorted_options
+    
+    def execute_option(self, option: Any, index: int, total: int) -> Dict[str, Any]:
+        """
+        Implement a single plan option and record the result.
         
-        # Execute each option in sequence
-        for i, option in enumerate(sorted_options, 1):
-            # Handle both dict and object formats
-            if isinstance(option, dict):
-                option_id = option.get("option_id", str(i))
-                description = option.get("description", "No description")
-                action = option.get("action", "unknown")
-                tool = option.get("tool", "unknown")
-                params = option.get("params", {})
-                priority = option.get("priority", "medium")
-            else:
-                option_id = getattr(option, "option_id", str(i))
-                description = getattr(option, "description", "No description")
-                action = getattr(option, "action", "unknown")
-                tool = getattr(option, "tool", "unknown")
-                params = getattr(option, "params", {})
-                priority = getattr(option, "priority", "medium")
-            
-            self.state.current_option_id = option_id
-            
-            if is_verbose():
-                verbose_print(f"\n[Option {i}/{len(sorted_options)}]", prefix="[ENGINEER]")
-                verbose_print(f"  ID: {option_id}", prefix="[ENGINEER]")
-                verbose_print(f"  Priority: {priority}", prefix="[ENGINEER]")
-                verbose_print(f"  Action: {action}", prefix="[ENGINEER]")
-                verbose_print(f"  Tool: {tool}", prefix="[ENGINEER]")
-                verbose_print(f"  Description: {description}", prefix="[ENGINEER]")
-            
-            print(f"\n  [{i}/{len(sorted_options)}] [{priority.upper()}] {description}")
-            print(f"      Action: {action} | Tool: {tool}")
-            
-            # Use LLM to determine how to implement this option
-            execution_result = self._implement_option(
-                option_id=option_id,
-                description=description,
-                option_data=option if isinstance(option, dict) else {
-                    "option_id": option_id,
-                    "description": description,
-                    "action": action,
-                    "tool": tool,
-                    "params": params,
-                    "priority": priority
-                }
-            )
-            
-            # Extract tool information from execution result
-            executed_tools = execution_result.get("executed_tools", [])
-            # For ActionRecord, use the first tool if multiple were called
-            actual_tool = executed_tools[0].get("tool", "unknown") if executed_tools else "unknown"
-            actual_params = executed_tools[0].get("params", {}) if executed_tools else {}
-            
-            # Record the action
-            action_record = ActionRecord(
-                step_id=option_id,
-                tool=actual_tool,
-                input=actual_params,
-                output_uri=execution_result.get("file_path", ""),
-                summary=execution_result.get("message", ""),
-                status=execution_result.get("status", "unknown")
-            )
+        Safe to call concurrently for options of the same plan: the LLM reasoning
+        runs in parallel, then each option waits for the options before it and
+        applies its changes in priority (index) order, so the resulting config
+        and action records match sequential execution. The option's turn is
+        handed on however this call ends, so a failing option never blocks
+        the ones after it.
+        
+        Args:
+            option: Option from the plan (pydantic model or dict)
+            index: 1-based position of the option in the execution order
+            total: Number of options being executed
             
+        Returns:
+            Dictionary with "action_record" (ActionRecord) and "summary" (dict)
+        """
+        try:
+            return self._execute_option(option, index, total)
+        finally:
+            self._pass_turn(index)
+    
+    def _execute_option(self, option: Any, index: int, total: int) -> Dict[str, Any]:
+        """Body of execute_option (the caller hands on the apply turn)."""
+        # Planner options are pydantic models; work on their dict form so
+        # metadata/solution and any extra fields reach the LLM prompt
+        if hasattr(option, "model_dump"):
+            option = option.model_dump(exclude_none=True)
+        
+        # Handle both dict and object formats
+        if isinstance(option, dict):
+            option_id = option.get("option_id", str(index))
+            description = option.get("description", "No description")
+            action = option.get("action", "unknown")
+            tool = option.get("tool", "unknown")
+            params = option.get("params", {})
+            priority = option.get("priority", "medium")
+        else:
+            option_id = getattr(option, "option_id", str(index))
+            description = getattr(option, "description", "No description")
+            action = getattr(option, "action", "unknown")
+            tool = getattr(option, "tool", "unknown")
+            params = getattr(option, "params", {})
+            priority = getattr(option, "priority", "medium")
+        
+        if is_verbose():
+            verbose_print(f"\n[Option {index}/{total}]", prefix="[ENGINEER]")
+            verbose_print(f"  ID: {option_id}", prefix="[ENGINEER]")
+            verbose_print(f"  Priority: {priority}", prefix="[ENGINEER]")
+            verbose_print(f"  Action: {action}", prefix="[ENGINEER]")
+            verbose_print(f"  Tool: {tool}", prefix="[ENGINEER]")
+            verbose_print(f"  Description: {description}", prefix="[ENGINEER]")
+        
+        print(f"\n  [{index}/{total}] [{priority.upper()}] {description}")
+        print(f"      Action: {action} | Tool: {tool}")
+        
+        # Use LLM to determine how to implement this option (overlaps with other options)
+        llm_response = self._reason_option(
+            option_id=option_id,
+            description=description,
+            option_data=option if isinstance(option, dict) else {
+                "option_id": option_id,
+                "description": description,
+                "action": action,
+                "tool": tool,
+                "params": params,
+                "priority": priority
+            }
+        )
+        
+        # Apply the changes once every higher-priority option has applied its own
+        if self._wait_for_turn(index):
+            with self._state_lock:
+                self.state.current_option_id = option_id
+            execution_result = self._implement_option(option_id, llm_response)
+        else:
+            execution_result = {
+                "option_id": option_id,
+                "status": "failed",
+                "message": f"Timed out after {self.OPTION_TURN_TIMEOUT:g}s waiting for earlier options to apply",
+                "file_path": "",
+                "changes": {}
+            }
+        
+        # Extract tool information from execution result
+        executed_tools = execution_result.get("executed_tools", [])
+        # For ActionRecord, use the first tool if multiple were called
+        actual_tool = executed_tools[0].get("tool", "unknown") if executed_tools else "unknown"
+        actual_params = executed_tools[0].get("params", {}) if executed_tools else {}
+        
+        # Record the action
+        action_record = ActionRecord(
+            step_id=option_id,
+            tool=actual_tool,
+            input=actual_params,
+            output_uri=execution_result.get("file_path", ""),
+            summary=execution_result.get("message", ""),
+            status=execution_result.get("status", "unknown")
+        )
+        
+        status = execution_result.get("status")
+        with self._state_lock:
             self.state.action_records.append(action_record)
-            results["action_records"].append(action_record)
-            
-            # Update counters
-            status = execution_result.get("status")
             if status == "success":
                 self.state.completed_options.append(option_id)
-                results["completed"] += 1
-                print(f"      ✅ Success: {execution_result.get('message', '')}")
-            elif status == "skipped":
-                results["skipped"] += 1
-                print(f"      ⏭️  Skipped: {execution_result.get('message', '')}")
-            else:
+            elif status != "skipped":
                 self.state.failed_options.append(option_id)
-                results["failed"] += 1
-                print(f"      ❌ Failed: {execution_result.get('message', '')}")
-            
-            results["summary"].append({
+        
+        if status == "success":
+            print(f"      ✅ Success: {execution_result.get('message', '')}")
+        elif status == "skipped":
+            print(f"      ⏭️  Skipped: {execution_result.get('message', '')}")
+        else:
+            print(f"      ❌ Failed: {execution_result.get('message', '')}")
+        
+        return {
+            "action_record": action_record,
+            "summary": {
                 "option_id": option_id,
                 "description": description,
                 "status": execution_result.get("status"),
                 "message": execution_result.get("message")
-            })
+            }
+        }
+    
+    def finish_plan(self, summary: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Report the outcome of a plan execution.
+        
+        Args:
+            summary: Per-option summaries returned by execute_option
+            
+        Returns:
+            Dictionary with "completed", "skipped" and "failed" counts
+        """
+        counts = {"completed": 0, "skipped": 0, "failed": 0}
+        for item in summary:
+            if item.get("status") == "success":
+                counts["completed"] += 1
+            elif item.get("status") == "skipped":
+                counts["skipped"] += 1
+            else:
+                counts["failed"] += 1
         
         # Final summary
         if is_verbose():
             verbose_print("=" * 70)
             verbose_print("ENGINEER: PLAN EXECUTION COMPLETE", prefix="[ENGINEER]")
             verbose_print("=" * 70)
-            verbose_print(f"Completed: {results['completed']}", prefix="[ENGINEER]")
-            verbose_print(f"Skipped: {results['skipped']}", prefix="[ENGINEER]")
-            verbose_print(f"Failed: {results['failed']}", prefix="[ENGINEER]")
-            verbose_print(f"Total Actions: {len(results['action_records'])}", prefix="[ENGINEER]")
+            verbose_print(f"Completed: {counts['completed']}", prefix="[ENGINEER]")
+            verbose_print(f"Skipped: {counts['skipped']}", prefix="[ENGINEER]")
+            verbose_print(f"Failed: {counts['failed']}", prefix="[ENGINEER]")
+            verbose_print(f"Total Actions: {len(summary)}", prefix="[ENGINEER]")
             verbose_print("=" * 70)
         
         print(f"\n✨ Plan execution complete:")
-        print(f"   ✅ Completed: {results['completed']}")
-        print(f"   ⏭️  Skipped: {results['skipped']}")
-        print(f"   ❌ Failed: {results['failed']}")
+        print(f"   ✅ Completed: {counts['completed']}")
+        print(f"   ⏭️  Skipped: {counts['skipped']}")
+        print(f"   ❌ Failed: {counts['failed']}")
         
         # Show configuration changes if any
-        if results['completed'] > 0:
+        if counts['completed'] > 0:
             self.tool_registry.print_config_summary()
             self.tool_registry.print_config_diff()
         
-        return results
+        return counts
     
-    def _implement_option(
+    def _wait_for_turn(self, index: int) -> bool:
+        """
+        Wait until the options before `index` have been applied.
+        
+        Args:
+            index: 1-based position of the option in the execution order
+            
+        Returns:
+            True when it is this option's turn, False after OPTION_TURN_TIMEOUT
+        """
+        with self._apply_turn:
+            return self._apply_turn.wait_for(lambda: self._next_to_apply >= index, timeout=self.OPTION_TURN_TIMEOUT)
+    
+    def _pass_turn(self, index: int) -> None:
+        """Let the option after `index` apply its changes."""
+        with self._apply_turn:
+            self._next_to_apply = max(self._next_to_apply, index + 1)
+            self._apply_turn.notify_all()
+    
+    def _reason_option(
         self,
         option_id: str,
         description: str,
@@ -336,13 +458,16 @@ Output ONLY JSON, no markdown."""
         """
         Use LLM to determine how to implement this high-level option.
         
+        Does not touch the config or agent state, so options of the same plan
+        can reason concurrently.
+        
         Args:
             option_id: Unique identifier for this option
             description: Human-readable description of what to do
             option_data: Full option data from the plan
             
         Returns:
-            Dictionary with execution results
+            LLM response with action, tool_calls and optional skip_reason (or error)
         """
         try:
             if is_verbose():
@@ -350,7 +475,36 @@ Output ONLY JSON, no markdown."""
                 verbose_print(f"  Description: {description}", prefix="[ENGINEER]")
             
             # Call LLM to reason about implementation (with retries)
-            llm_response = self._call_llm_for_implementation(description, option_data)
+            return self._call_llm_for_implementation(description, option_data)
+        
+        except Exception as e:
+            error_msg = f"Exception during LLM reasoning: {str(e)}"
+            verbose_print(error_msg, prefix="[ENGINEER]")
+            import traceback
+            if is_verbose():
+                verbose_print(traceback.format_exc(), prefix="[ENGINEER]")
+            return {"action": "execute", "tool_calls": [], "error": error_msg}
+    
+    def _implement_option(self, option_id: str, llm_response: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute the tool calls the LLM chose for an option.
+        
+        Args:
+            option_id: Unique identifier for this option
+            llm_response: Result of _reason_option for this option
+            
+        Returns:
+            Dictionary with execution results
+        """
+        try:
+            if llm_response.get("error"):
+                return {
+                    "option_id": option_id,
+                    "status": "failed",
+                    "message": llm_response["error"],
+                    "file_path": "",
+                    "changes": {}
+                }
             
             # Check if LLM chose to skip this option
             if llm_response.get("action") == "skip":
@@ -382,68 +536,22 @@ Output ONLY JSON, no markdown."""
             if is_verbose():
                 verbose_print(f"[LLM RESULT] Generated {len(tool_calls)} tool calls", prefix="[ENGINEER]")
             
-            # Execute each tool call
-            all_changes = []
-            messages = []
-            successful_calls = 0
-            placeholder_tool_used = False  # Track if we've used the placeholder tool
-            
-            for i, tool_call in enumerate(tool_calls, 1):
-                tool_name = tool_call.get("tool", "unknown")
-                params = tool_call.get("params", {})
-                
-                # CRITICAL SAFEGUARD: Prevent multiple placeholder calls
-                if tool_name == "add_environment_variable_placeholder":
-                    # Check if already used in previous options
-                    for record in self.state.action_records:
-                        if record.tool == "add_environment_variable_placeholder":
-                            error_msg = "⚠️ BLOCKED: add_environment_variable_placeholder already called in a previous option. Only ONE placeholder variable allowed per rehosting cycle."
-                            verbose_print(f"  🚫 {error_msg}", prefix="[ENGINEER]")
-                            messages.append(error_msg)
-                            continue
-                    
-                    # Check if already used in current option
-                    if placeholder_tool_used:
-                        error_msg = "⚠️ BLOCKED: Multiple add_environment_variable_placeholder calls detected. Only ONE allowed."
-                        verbose_print(f"  🚫 {error_msg}", prefix="[ENGINEER]")
-                        messages.append(error_msg)
-                        continue
-                    
-                    placeholder_tool_used = True
-                
-                verbose_print(f"[EXECUTING {i}/{len(tool_calls)}] Tool: {tool_name}", prefix="[ENGINEER]")
-                verbose_print(f"  Params: {json.dumps(params, indent=2)}", prefix="[ENGINEER]")
-                
-                # Get the tool function from registry
-                tool_func = self.tool_registry.get_tool(tool_name)
-                if not tool_func:
-                    error_msg = f"Unknown tool: {tool_name}"
-                    verbose_print(f"  ❌ {error_msg}", prefix="[ENGINEER]")
-                    messages.append(f"Failed: {error_msg}")
-                    continue
-                
-                try:
-                    # Call the tool with parameters
-                    result = tool_func(**params)
-                    
-                    if result.get("status") == "success":
-                        successful_calls += 1
-                        verbose_print(f"  ✅ Success: {result.get('message', '')}", prefix="[ENGINEER]")
-                        messages.append(f"Success: {result.get('message', '')}")
-                        
-                        # Collect changes for summary
-                        changes = result.get("changes", {})
-                        if changes:
-                            all_changes.append(changes)
-                    else:
-                        error_msg = result.get("message", "Unknown error")
-                        verbose_print(f"  ❌ Failed: {error_msg}", prefix="[ENGINEER]")
-                        messages.append(f"Failed: {error_msg}")
-                        
-                except Exception as e:
-                    error_msg = f"Tool execution error: {str(e)}"
-                    verbose_print(f"  ❌ {error_msg}", prefix="[ENGINEER]")
-                    messages.append(f"Error: {error_msg}")
+            # Options apply one at a time (see _wait_for_turn), and all of an
+            # option's changes are written to config.yaml once at the end
+            try:
+                with self.tool_registry.batch():
+                    successful_calls, messages, all_changes = self._run_tool_calls(tool_calls)
+            except OSError as e:
+                error_msg = f"Failed to save config changes: {e}"
+                verbose_print(f"  ❌ {error_msg}", prefix="[ENGINEER]")
+                return {
+                    "option_id": option_id,
+                    "status": "failed",
+                    "message": error_msg,
+                    "file_path": str(self.project_path / "config.yaml"),
+                    "changes": {},
+                    "executed_tools": tool_calls
+                }
             
             # Determine overall status
             if successful_calls == len(tool_calls):
@@ -466,7 +574,7 @@ Output ONLY JSON, no markdown."""
             }
             
         except Exception as e:
-            error_msg = f"Exception during LLM reasoning: {str(e)}"
+            error_msg = f"Exception while applying option: {str(e)}"
             verbose_print(error_msg, prefix="[ENGINEER]")
             import traceback
             if is_verbose():
@@ -480,6 +588,81 @@ Output ONLY JSON, no markdown."""
                 "changes": {}
             }
     
+    def _run_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> Tuple[int, List[str], List[Dict[str, Any]]]:
+        """
+        Execute an option's tool calls against the tool registry.
+        
+        Args:
+            tool_calls: Tool calls generated by the LLM ({"tool": ..., "params": ...})
+            
+        Returns:
+            Tuple of (number of successful calls, result messages, collected changes)
+        """
+        all_changes = []
+        messages = []
+        successful_calls = 0
+        placeholder_tool_used = False  # Track if we've used the placeholder tool
+        
+        for i, tool_call in enumerate(tool_calls, 1):
+            tool_name = tool_call.get("tool", "unknown")
+            params = tool_call.get("params", {})
+            
+            # CRITICAL SAFEGUARD: Prevent multiple placeholder calls
+            if tool_name == "add_environment_variable_placeholder":
+                # Check if already used in previous options
+                if self.state.placeholder_used and not placeholder_tool_used:
+                    error_msg = "⚠️ BLOCKED: add_environment_variable_placeholder already called in a previous option. Only ONE placeholder variable allowed per rehosting cycle."
+                    verbose_print(f"  🚫 {error_msg}", prefix="[ENGINEER]")
+                    messages.append(error_msg)
+                    continue
+                
+                # Check if already used in current option
+                if placeholder_tool_used:
+                    error_msg = "⚠️ BLOCKED: Multiple add_environment_variable_placeholder calls detected. Only ONE allowed."
+                    verbose_print(f"  🚫 {error_msg}", prefix="[ENGINEER]")
+                    messages.append(error_msg)
+                    continue
+            
+            verbose_print(f"[EXECUTING {i}/{len(tool_calls)}] Tool: {tool_name}", prefix="[ENGINEER]")
+            verbose_print(f"  Params: {json.dumps(params, indent=2)}", prefix="[ENGINEER]")
+            
+            # Get the tool function from registry
+            tool_func = self.tool_registry.get_tool(tool_name)
+            if not tool_func:
+                error_msg = f"Unknown tool: {tool_name}"
+                verbose_print(f"  ❌ {error_msg}", prefix="[ENGINEER]")
+                messages.append(f"Failed: {error_msg}")
+                continue
+            
+            try:
+                # Call the tool with parameters
+                result = tool_func(**params)
+                
+                if result.get("status") == "success":
+                    successful_calls += 1
+                    if tool_name == "add_environment_variable_placeholder":
+                        # Only a placeholder that was actually added counts toward the limit
+                        placeholder_tool_used = True
+                        self.state.placeholder_used = True
+                    verbose_print(f"  ✅ Success: {result.get('message', '')}", prefix="[ENGINEER]")
+                    messages.append(f"Success: {result.get('message', '')}")
+                    
+                    # Collect changes for summary
+                    changes = result.get("changes", {})
+                    if changes:
+                        all_changes.append(changes)
+                else:
+                    error_msg = result.get("message", "Unknown error")
+                    verbose_print(f"  ❌ Failed: {error_msg}", prefix="[ENGINEER]")
+                    messages.append(f"Failed: {error_msg}")
+            
+            except Exception as e:
+                error_msg = f"Tool execution error: {str(e)}"
+                verbose_print(f"  ❌ {error_msg}", prefix="[ENGINEER]")
+                messages.append(f"Error: {error_msg}")
+        
+        return successful_calls, messages, all_changes
+    
     def _call_llm_for_implementation(
         self,
         description: str,
@@ -504,13 +687,13 @@ Output ONLY JSON, no markdown."""
                 is_retry = attempt > 0
                 
                 # Query KB for implementation guidance (if enabled)
-                kb_guidance = self.kb.query_for_engineer(description) if self.kb is not None else []
+                kb_guidance = list(islice(self.kb.iter_engineer(description), 3)) if self.kb is not None else []  # Max 3 guidance items
                 
                 # Build prompt with KB guidance
                 kb_context = ""
                 if kb_guidance:
                     kb_context = "\n\nKnowledge Base Guidance:\n"
-                    for i, guidance in enumerate(kb_guidance[:3], 1):  # Max 3 guidance items
+                    for i, guidance in enumerate(kb_guidance, 1):
                         kb_context += f"\nGuidance {i} - {guidance.get('title', 'Unknown Issue')}:\n"
                         kb_context += f"  Tool: {guidance.get('tool', 'unknown')}\n"
                         kb_context += f"  Action: {guidance.get('action', 'unknown')}\n"
@@ -579,8 +762,9 @@ Generate the implementation plan as JSON."""
                     verbose_print(user_prompt)
                     verbose_print("=" * 70)
                 
-                # Call LLM
-                response: ChatResponse = chat(
+                # Call LLM (ollama imported lazily to keep module import cheap)
+                from ollama import chat
+                response: "ChatResponse" = chat(
                     model=self.model,
                     messages=messages,
                     format="json",
@@ -705,6 +889,10 @@ Generate the implementation plan as JSON."""
             "discovery_mode": False,  # Always exit discovery mode after engineer executes
             "discovery_variable": ""  # Clear the variable
         }
+    
+    async def aexecute_option(self, option: Any, index: int, total: int) -> Dict[str, Any]:
+        """Async variant of execute_option; runs in a worker thread so the options' LLM calls overlap."""
+        return await asyncio.to_thread(self.execute_option, option, index, total)
 
 
 # Convenience function for creating an engineer instance
@@ -4,15 +4,108 @@ Extended Planner agent specialized for firmware rehosting configuration.
 This extends the base PlannerAgent with firmware-specific knowledge and prompts.
 """
 
-from typing import Dict, Any, List, Optional
-from pydantic import BaseModel, Field
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Literal, Mapping, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from pathlib import Path
 from src.rehosting.schemas import State
 from src.rehosting.knowledge_base import KnowledgeBase, get_knowledge_base
+import asyncio
+import hashlib
 import json
-import uuid
-from ollama import chat, ChatResponse
-from src.settings import is_verbose, verbose_print
+import os
+import re
+import secrets
+import tempfile
+import time
+from functools import lru_cache
+from src.settings import is_verbose, verbose_print, verbose_print_lazy
+
+if TYPE_CHECKING:
+    from ollama import AsyncClient
+
+# orjson is an optional speed-up (not in requirements.txt); fall back to the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data: str) -> Any:
+    """Parse JSON, using orjson when available (its JSONDecodeError subclasses json's)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_pretty(obj: Any) -> str:
+    """Serialize to 2-space indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def _tail(items: List[Any], count: int) -> Iterator[Any]:
+    """Iterate over the last ``count`` items of a list without copying a slice."""
+    total = len(items)
+    return (items[i] for i in range(max(0, total - count), total))
+
+
+# Console log symptoms: (patterns that must ALL match, symptom reported to the KB).
+# Case-insensitive regexes avoid lowercasing a copy of the whole (possibly multi-MB) log.
+_CONSOLE_PATTERNS = [
+    ((re.compile(r"no configuration|missing configuration", re.I),),
+     "Console errors about missing configuration"),
+    ((re.compile(r"/dev/", re.I), re.compile(r"not found|no such", re.I)),
+     "/dev/* file not found"),
+]
+
+# Markdown code fence (``` or ```json) wrapping a JSON payload
+_FENCE_RE = re.compile(r"```(?:json)?\s*\n(.*?)\n\s*```", re.DOTALL)
+
+
+class _JsonObjectTracker:
+    """Incrementally track brace depth of a streamed JSON object, ignoring braces inside strings."""
+    
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> bool:
+        """Consume a chunk of text. Returns True once the top-level object has closed."""
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+                self.started = True
+            elif ch == "}":
+                self.depth -= 1
+                if self.started and self.depth == 0:
+                    return True
+        return False
+
+
+class FirmwareOption(BaseModel):
+    """A single configuration update option proposed by the planner."""
+    
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+    
+    option_id: str = Field(description="Identifier of the option within the plan")
+    description: str = Field(description="Brief summary of the option")
+    problem: str = Field(description="Specific problem the option addresses")
+    solution: Any = Field(description="Solution approach (text or structured action)")
+    priority: Literal["critical", "high", "medium", "low"] = Field(description="Execution priority")
+    impact: Optional[str] = Field(default=None, description="Expected impact")
+    metadata: Optional[Dict[str, Any]] = Field(default=None, description="Structured data for the Engineer")
 
 
 class FirmwareConfigPlan(BaseModel):
@@ -20,7 +113,7 @@ class FirmwareConfigPlan(BaseModel):
 
     id: str = Field(description="Unique identifier for this plan")
     objectives: List[str] = Field(description="High-level objectives to achieve")
-    options: List[Dict[str, Any]] = Field(
+    options: List[FirmwareOption] = Field(
         description="List of possible configuration update options for evaluator/engineer to prioritize"
     )
 
@@ -56,6 +149,9 @@ class FirmwarePlannerAgent:
         ]
     }
     
+    # Hard cap on generated tokens per LLM call
+    MAX_NUM_PREDICT = 2048
+    
     # System prompt - contains all instructions and guidelines
     SYSTEM_PROMPT = """You are a firmware rehosting planner analyzing Penguin configuration issues.
 
@@ -135,50 +231,138 @@ Generate a plan in JSON format following the standard schema with EXACTLY ONE op
 
 Output ONLY valid JSON matching the schema."""
 
-    def __init__(self, model: str = "llama3.3:latest", max_retries: int = 3, kb_path: Optional[Path] = None):
-        """Initialize firmware-specific planner."""
+    def __init__(self, model: str = "llama3.3:latest", max_retries: int = 3, kb_path: Optional[Path] = None, keep_alive: str = "30m", max_concurrency: int = 2,
+                 cache: bool = False, cache_dir: Optional[Path] = None, cache_max_age: float = 24 * 3600):
+        """
+        Initialize firmware-specific planner.
+        
+        Args:
+            model: Ollama model name
+            max_retries: Maximum attempts before falling back to a placeholder plan
+            kb_path: Path to knowledge base file (optional)
+            keep_alive: How long Ollama keeps the model loaded between calls
+            max_concurrency: Maximum concurrent LLM requests per plan
+            cache: Reuse on-disk responses for identical (model, messages, options) calls.
+                Forces temperature=0 so cached outputs are deterministic.
+            cache_dir: Directory for cached responses (default: ~/.cache/tinker/planner)
+            cache_max_age: Seconds before a cached response is considered stale
+        """
         self.model = model
+        self.keep_alive = keep_alive
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self._cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".cache" / "tinker" / "planner"
+        self.cache_max_age = cache_max_age
+        self._config_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
         self.plan_schema = FirmwareConfigPlan
         self.max_retries = max_retries
         self.kb = get_knowledge_base(kb_path)
+        
+        # System prompts only depend on class constants - build them once so the
+        # system message is byte-identical across calls and Ollama can reuse its
+        # prompt KV cache for this prefix
+        self._schema_str = _json_dumps_pretty(self.EXPECTED_RESPONSE_SCHEMA)
+        self._normal_system_prompt = f"""{self.SYSTEM_PROMPT}
+
+## Expected JSON Output Format
+
+{self._schema_str}"""
+        self._retry_system_prompt = self.RETRY_SYSTEM_PROMPT.format(schema=self._schema_str)
+    
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _discovery_prompt(cls, variable_name: str) -> str:
+        """Render the discovery mode system prompt for a variable (cached per variable)."""
+        return cls.DISCOVERY_MODE_PROMPT.format(variable_name=variable_name)
     
     def plan(self, state: State) -> FirmwareConfigPlan:
-        """Generate firmware configuration update plan."""
-        context = self._build_context(state)
+        """
+        Generate firmware configuration update plan.
+        
+        Runs its own event loop, so it cannot be called from a coroutine;
+        async callers await acall() instead.
+        
+        Raises:
+            RuntimeError: If called while an event loop is running in this thread
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._plan_async(state))
+        raise RuntimeError("FirmwarePlannerAgent.plan() called from a running event loop; await acall() instead")
+    
+    async def _plan_async(self, state: State) -> FirmwareConfigPlan:
+        """
+        Generate the plan, racing a speculative backup attempt against the first one.
+        
+        The first round issues the normal attempt (temp=0.7) and a retry-prompt
+        attempt without an error preamble (temp=0.3) concurrently and returns whichever response parses
+        first, cancelling the other. Later rounds fall back to one retry at a time.
+        Concurrent requests per model are capped by ``max_concurrency``.
+        """
+        context = await self._build_context(state)
         user_prompt = self._build_prompt(state, context)
         
+        # Imported lazily: ollama pulls in httpx/pydantic, which callers that only
+        # need the plan schema shouldn't pay for
+        import httpx
+        from ollama import AsyncClient, ResponseError
+        
+        # A failed request counts as a failed attempt, like an unparseable response
+        attempt_errors = (json.JSONDecodeError, ValueError, KeyError, ResponseError, httpx.HTTPError, ConnectionError)
+        
+        # Client and semaphore are bound to the running event loop, so create them per plan
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run_attempt(is_retry: bool, previous_error: Optional[str]) -> str:
+            async with semaphore:
+                return await self._call_llm(client, user_prompt, is_retry=is_retry, previous_error=previous_error, state=state)
+        
         last_error = None
+        response = None
         for attempt in range(self.max_retries):
+            if attempt == 0:
+                tasks = [
+                    asyncio.create_task(run_attempt(False, None)),
+                    asyncio.create_task(run_attempt(True, None)),
+                ]
+            else:
+                tasks = [asyncio.create_task(run_attempt(True, last_error))]
+            
             try:
-                is_retry = attempt > 0
-                response = self._call_llm(user_prompt, is_retry=is_retry, previous_error=last_error, state=state)
-                plan = self._parse_plan(response)
-                
-                if attempt > 0:
-                    print(f"[Planner] Successfully generated plan on retry attempt {attempt + 1}")
-                
-                if is_verbose():
-                    verbose_print("=" * 70)
-                    verbose_print("GENERATED PLAN (PARSED)", prefix="[PLANNER]")
-                    verbose_print("=" * 70)
-                    verbose_print(f"Plan ID: {plan.id}", prefix="[PLANNER]")
-                    if hasattr(plan, 'model_dump'):
-                        verbose_print(json.dumps(plan.model_dump(), indent=2))
-                    else:
-                        verbose_print(str(plan))
-                    verbose_print("=" * 70)
-                
-                return plan
-                
-            except (json.JSONDecodeError, ValueError, KeyError) as e:
-                last_error = str(e)
-                print(f"[Planner] Attempt {attempt + 1}/{self.max_retries} failed: {last_error}")
-                
-                if attempt == self.max_retries - 1:
-                    print(f"[Planner] All {self.max_retries} attempts failed. Creating fallback plan.")
-                    return self._create_fallback_plan(last_error, response if 'response' in locals() else "No response")
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        response = await next_done
+                        plan = self._parse_plan(response)
+                    except attempt_errors as e:
+                        last_error = str(e)
+                        continue
+                    
+                    if attempt > 0:
+                        print(f"[Planner] Successfully generated plan on retry attempt {attempt + 1}")
+                    
+                    if is_verbose():
+                        verbose_print("=" * 70)
+                        verbose_print("GENERATED PLAN (PARSED)", prefix="[PLANNER]")
+                        verbose_print("=" * 70)
+                        verbose_print(f"Plan ID: {plan.id}", prefix="[PLANNER]")
+                        if hasattr(plan, 'model_dump'):
+                            verbose_print_lazy(lambda: _json_dumps_pretty(plan.model_dump()))
+                        else:
+                            verbose_print(str(plan))
+                        verbose_print("=" * 70)
+                    
+                    return plan
+            finally:
+                # Drop whichever speculative request is still in flight
+                for task in tasks:
+                    task.cancel()
+            
+            print(f"[Planner] Attempt {attempt + 1}/{self.max_retries} failed: {last_error}")
         
-        return self._create_fallback_plan("Unknown error", "No response")
+        print(f"[Planner] All {self.max_retries} attempts failed. Creating fallback plan.")
+        return self._create_fallback_plan(last_error or "Unknown error", response or "No response")
     
     def _parse_plan(self, response: str) -> FirmwareConfigPlan:
         """
@@ -187,70 +371,37 @@ Output ONLY valid JSON matching the schema."""
         Overrides base parser to validate firmware-specific schema.
         
         Raises:
-            json.JSONDecodeError: If response is not valid JSON
-            ValueError: If JSON doesn't match expected schema
-            KeyError: If required fields are missing
+            ValueError: If response is not valid JSON or doesn't match expected schema
         """
-        import json
-        import uuid
-        
         # First attempt: direct JSON parsing
         try:
-            plan_data = json.loads(response)
+            plan_data = _json_loads(response)
         except json.JSONDecodeError as e:
             # Try to extract JSON from markdown code blocks
-            if "```json" in response or "```" in response:
+            fence_match = _FENCE_RE.search(response)
+            if fence_match:
                 try:
-                    json_start = response.find("```json")
-                    if json_start == -1:
-                        json_start = response.find("```")
-                    json_start = response.find("\n", json_start) + 1
-                    json_end = response.find("```", json_start)
-                    json_str = response[json_start:json_end].strip()
-                    plan_data = json.loads(json_str)
-                except (ValueError, json.JSONDecodeError) as extract_error:
-                    raise json.JSONDecodeError(
-                        f"Failed to parse JSON from response. Original error: {str(e)}, Extract error: {str(extract_error)}",
-                        response, 0
-                    )
+                    plan_data = _json_loads(fence_match.group(1))
+                except ValueError as extract_error:
+                    # Keep the parser message: it is fed back to the LLM on retry
+                    raise ValueError(f"Failed to parse JSON from fenced block: {extract_error}") from e
             else:
-                raise json.JSONDecodeError(f"Response is not valid JSON: {str(e)}", response, 0)
+                raise ValueError(f"Response is not valid JSON: {e}") from e
         
-        # Validate required fields for firmware plans
-        required_fields = ["objectives", "options"]
-        missing_fields = [field for field in required_fields if field not in plan_data]
-        if missing_fields:
-            raise KeyError(f"Missing required fields: {', '.join(missing_fields)}")
+        if not isinstance(plan_data, dict):
+            raise ValueError("Plan must be a JSON object")
         
         # Ensure we have a unique ID
         if "id" not in plan_data or not plan_data["id"]:
-            plan_data["id"] = f"fw_plan_{uuid.uuid4().hex[:8]}"
-        
-        # Validate options structure
-        if not isinstance(plan_data["options"], list):
-            raise ValueError("'options' must be a list")
-        
-        for i, option in enumerate(plan_data["options"]):
-            if not isinstance(option, dict):
-                raise ValueError(f"Option {i} must be a dictionary")
-            option_required = ["option_id", "description", "problem", "solution", "priority"]
-            option_missing = [field for field in option_required if field not in option]
-            if option_missing:
-                raise KeyError(f"Option {i} missing required fields: {', '.join(option_missing)}")
-            
-            # Validate priority values
-            valid_priorities = ["critical", "high", "medium", "low"]
-            if option["priority"] not in valid_priorities:
-                raise ValueError(f"Option {i} has invalid priority '{option['priority']}'. Must be one of: {', '.join(valid_priorities)}")
+            plan_data["id"] = f"fw_plan_{secrets.token_hex(4)}"
         
-        # Create plan object using firmware schema
+        # Validate against the firmware schema (required fields, option structure, priorities)
         try:
-            plan = self.plan_schema(**plan_data)
-            return plan
-        except Exception as e:
+            return self.plan_schema.model_validate(plan_data)
+        except ValidationError as e:
             raise ValueError(f"Failed to instantiate firmware plan schema: {str(e)}")
     
-    def _build_context(self, state: State) -> str:
+    async def _build_context(self, state: State) -> str:
         """
         Build contextual information from state, enriched with KB insights and previous execution context.
         
@@ -277,20 +428,18 @@ Output ONLY valid JSON matching the schema."""
             if is_verbose():
                 verbose_print(f"[PLANNER] DISCOVERY MODE active for variable: {state.discovery_variable}", prefix="[CONTEXT]")
             
-            context_parts.append(f"## 🔍 DISCOVERY MODE - Variable: {state.discovery_variable}")
-            context_parts.append("Analyzing env_cmp.txt for candidate values and console output for errors.")
-            context_parts.append("")
+            context_parts.extend((
+                f"## 🔍 DISCOVERY MODE - Variable: {state.discovery_variable}",
+                "Analyzing env_cmp.txt for candidate values and console output for errors.",
+                "",
+            ))
             
             # Extract only relevant sources using dict keys
             if "env_cmp.txt" in state.rag_context:
-                context_parts.append("## env_cmp.txt (Discovered Candidates):")
-                context_parts.append(state.rag_context["env_cmp.txt"])
-                context_parts.append("")
+                context_parts.extend(("## env_cmp.txt (Discovered Candidates):", state.rag_context["env_cmp.txt"], ""))
             
             if "console.log" in state.rag_context:
-                context_parts.append("## console.log (Error Context):")
-                context_parts.append(state.rag_context["console.log"])
-                context_parts.append("")
+                context_parts.extend(("## console.log (Error Context):", state.rag_context["console.log"], ""))
             
             if "env_cmp.txt" not in state.rag_context and "console.log" not in state.rag_context:
                 context_parts.append("## Note: No env_cmp.txt or console.log found in context")
@@ -300,82 +449,86 @@ Output ONLY valid JSON matching the schema."""
             return "\n".join(context_parts)
         
         # NORMAL MODE: Full context building
+        # Query Knowledge Base for strategic insights (if enabled) in a worker
+        # thread so it overlaps with reading config.yaml and formatting context
+        symptoms = self._extract_symptoms(state.rag_context)
+        kb_task = None
+        if symptoms and self.kb is not None:
+            kb_task = asyncio.create_task(asyncio.to_thread(self.kb.query_for_planner, symptoms))
+        
         # Add previous config.yaml from project if available
         if state.project_path:
             config_path = Path(state.project_path) / "config.yaml"
-            if config_path.exists():
-                try:
-                    with open(config_path, 'r') as f:
-                        config_content = f.read()
-                    context_parts.append("## Previous Penguin Configuration (config.yaml):")
-                    context_parts.append("This is the configuration used in the previous rehosting attempt.")
-                    context_parts.append("```yaml")
-                    context_parts.append(config_content)
-                    context_parts.append("```")
-                    context_parts.append("")  # Empty line for separation
-                    
-                    if is_verbose():
-                        verbose_print(f"[PLANNER] Loaded config.yaml from: {config_path}", prefix="[CONTEXT]")
-                except Exception as e:
-                    context_parts.append(f"## Note: Could not read config.yaml: {str(e)}")
-                    if is_verbose():
-                        verbose_print(f"[PLANNER] Failed to load config.yaml: {e}", prefix="[CONTEXT]")
+            try:
+                config_content = self._read_config_yaml(config_path)
+            except Exception as e:
+                config_content = None
+                context_parts.append(f"## Note: Could not read config.yaml: {str(e)}")
+                if is_verbose():
+                    verbose_print(f"[PLANNER] Failed to load config.yaml: {e}", prefix="[CONTEXT]")
+            
+            if config_content is not None:
+                context_parts.append(
+                    "## Previous Penguin Configuration (config.yaml):\n"
+                    "This is the configuration used in the previous rehosting attempt.\n"
+                    f"```yaml\n{config_content}\n```\n"  # Trailing empty line for separation
+                )
+                
+                if is_verbose():
+                    verbose_print(f"[PLANNER] Loaded config.yaml from: {config_path}", prefix="[CONTEXT]")
         
         if state.rag_context:
             context_parts.append("## Retrieved Context:")
             # Iterate through dict and format each source
-            for source, content in state.rag_context.items():
-                context_parts.append(f"\n### {source}:")
-                context_parts.append(content)
+            context_parts.extend(
+                f"\n### {source}:\n{content}" for source, content in state.rag_context.items()
+            )
         
         # Add previous execution context if available
-        if hasattr(state, 'previous_actions') and state.previous_actions:
-            context_parts.append("\n## Previous Execution History:")
-            context_parts.append(f"Total previous actions: {len(state.previous_actions)}")
+        if state.previous_actions:
+            context_parts.append(
+                f"\n## Previous Execution History:\nTotal previous actions: {len(state.previous_actions)}"
+            )
             
             # Group actions by iteration/option for better readability
-            for i, action in enumerate(state.previous_actions[-10:], 1):  # Show last 10 actions
-                context_parts.append(f"\nPrevious Action {i}:")
-                context_parts.append(f"  Step ID: {action.step_id}")
-                context_parts.append(f"  Tool: {action.tool}")
-                context_parts.append(f"  Status: {action.status}")
-                context_parts.append(f"  Summary: {action.summary}")
-                if action.input:
-                    context_parts.append(f"  Parameters: {action.input}")
-        
-        if hasattr(state, 'previous_engineer_summary') and state.previous_engineer_summary:
+            context_parts.append("\n".join(
+                self._format_previous_action(i, action)
+                for i, action in enumerate(_tail(state.previous_actions, 10), 1)  # Show last 10 actions
+            ))
+        
+        if state.previous_engineer_summary:
             context_parts.append("\n## Previous Engineer Summary:")
             if isinstance(state.previous_engineer_summary, list):
-                for i, summary in enumerate(state.previous_engineer_summary[-3:], 1):  # Show last 3 summaries
+                for i, summary in enumerate(_tail(state.previous_engineer_summary, 3), 1):  # Show last 3 summaries
                     context_parts.append(f"\nSummary {i}:")
                     if isinstance(summary, dict):
-                        for key, value in summary.items():
-                            context_parts.append(f"  {key}: {value}")
+                        context_parts.extend(f"  {key}: {value}" for key, value in summary.items())
                     else:
                         context_parts.append(f"  {summary}")
             else:
                 context_parts.append(f"  {state.previous_engineer_summary}")
         
-        # Query Knowledge Base for strategic insights (if enabled)
-        symptoms = self._extract_symptoms(state.rag_context)
-        if symptoms and self.kb is not None:
-            kb_insights = self.kb.query_for_planner(symptoms)
+        if kb_task is not None:
+            kb_insights = await kb_task
             
             if kb_insights:
-                context_parts.append("\n## Knowledge Base Insights:")
+                insight_parts = ["\n## Knowledge Base Insights:"]
                 for insight in kb_insights:
-                    context_parts.append(f"- Issue: {insight['title']}")
-                    context_parts.append(f"  Severity: {insight['severity']}")
-                    context_parts.append(f"  Priority: {insight.get('priority', 'medium')}")
-                    context_parts.append(f"  Impact: {insight.get('impact', 'medium')}")
-                    context_parts.append(f"  Description: {insight.get('description', '')}")
+                    insight_block = (
+                        f"- Issue: {insight['title']}\n"
+                        f"  Severity: {insight['severity']}\n"
+                        f"  Priority: {insight.get('priority', 'medium')}\n"
+                        f"  Impact: {insight.get('impact', 'medium')}\n"
+                        f"  Description: {insight.get('description', '')}"
+                    )
                     
                     # Add specific guidance from complete planner_view
                     if insight.get('requires_rerun'):
-                        context_parts.append(f"  ⚠️  Requires iteration: {insight.get('next_steps', 'Re-run needed')}")
+                        insight_block += f"\n  ⚠️  Requires iteration: {insight.get('next_steps', 'Re-run needed')}"
                     if insight.get('selection_criteria'):
-                        context_parts.append(f"  Selection: {insight['selection_criteria']}")
-                    context_parts.append("")
+                        insight_block += f"\n  Selection: {insight['selection_criteria']}"
+                    insight_parts.append(insight_block + "\n")
+                context_parts.extend(insight_parts)
                 
                 if is_verbose():
                     verbose_print(f"[PLANNER] KB returned {len(kb_insights)} insights", prefix="[KB]")
@@ -384,7 +537,44 @@ Output ONLY valid JSON matching the schema."""
         
         return context
     
-    def _extract_symptoms(self, rag_context: Dict[str, str]) -> List[str]:
+    def _read_config_yaml(self, config_path: Path) -> Optional[str]:
+        """
+        Read config.yaml, reusing the cached content while its mtime/size are unchanged.
+        
+        Returns:
+            File content, or None if the file does not exist
+        """
+        try:
+            st = os.stat(config_path)
+        except FileNotFoundError:
+            return None
+        
+        cache_key = str(config_path)
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._config_cache.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        with open(config_path, 'r') as f:
+            config_content = f.read()
+        self._config_cache[cache_key] = (signature, config_content)
+        return config_content
+    
+    @staticmethod
+    def _format_previous_action(index: int, action: Any) -> str:
+        """Format a single previous action record for the planner context."""
+        block = (
+            f"\nPrevious Action {index}:\n"
+            f"  Step ID: {action.step_id}\n"
+            f"  Tool: {action.tool}\n"
+            f"  Status: {action.status}\n"
+            f"  Summary: {action.summary}"
+        )
+        if action.input:
+            block += f"\n  Parameters: {action.input}"
+        return block
+    
+    def _extract_symptoms(self, rag_context: Mapping[str, str]) -> List[str]:
         """
         Extract symptoms from RAG context for Knowledge Base querying.
         
@@ -408,12 +598,10 @@ Output ONLY valid JSON matching the schema."""
             symptoms.append("env_cmp.txt contains dynamic discovery candidate values")
         
         if "console.log" in rag_context:
-            console_content = rag_context["console.log"].lower()
-            if "no configuration" in console_content or "missing configuration" in console_content:
-                symptoms.append("Console errors about missing configuration")
-            
-            if "/dev/" in console_content and ("not found" in console_content or "no such" in console_content):
-                symptoms.append("/dev/* file not found")
+            console_content = rag_context["console.log"]
+            for patterns, symptom in _CONSOLE_PATTERNS:
+                if all(pattern.search(console_content) for pattern in patterns):
+                    symptoms.append(symptom)
         
         if "pseudofiles_failures.yaml" in rag_context:
             symptoms.append("pseudofiles_failures.yaml shows device failures")
@@ -428,37 +616,32 @@ Output ONLY valid JSON matching the schema."""
         ]
         
         if state.budget:
-            prompt_parts.append(f"\n## Constraints:\n{json.dumps(state.budget, indent=2)}")
+            prompt_parts.append(f"\n## Constraints:\n{_json_dumps_pretty(state.budget)}")
         
         return "\n".join(prompt_parts)
     
-    def _call_llm(self, user_prompt: str, is_retry: bool = False, previous_error: Optional[str] = None, state: Optional[State] = None) -> str:
+    async def _call_llm(self, client: "AsyncClient", user_prompt: str, is_retry: bool = False, previous_error: Optional[str] = None, state: Optional[State] = None) -> str:
         """Call Ollama LLM to generate the plan."""
-        schema_str = json.dumps(self.EXPECTED_RESPONSE_SCHEMA, indent=2)
-        
         if is_retry:
-            system_prompt = self.RETRY_SYSTEM_PROMPT.format(schema=schema_str)
-            retry_user_prompt = f"""Previous attempt failed with error: {previous_error}
-
-{user_prompt}
+            # Retry prompt; previous_error is None for the speculative first-round attempt
+            system_prompt = self._retry_system_prompt
+            retry_user_prompt = f"""{user_prompt}
 
 REMEMBER: Output ONLY valid JSON matching the exact schema. No markdown, no explanations."""
+            if previous_error:
+                retry_user_prompt = f"Previous attempt failed with error: {previous_error}\n\n{retry_user_prompt}"
             user_prompt = retry_user_prompt
         else:
             # Use discovery mode prompt if in discovery mode
             if state and state.discovery_mode:
                 variable_name = state.discovery_variable or "unknown"
-                system_prompt = self.DISCOVERY_MODE_PROMPT.format(variable_name=variable_name)
+                system_prompt = self._discovery_prompt(variable_name)
                 
                 if is_verbose():
                     verbose_print(f"[PLANNER] Using DISCOVERY MODE prompt for variable: {variable_name}", prefix="[LLM]")
             else:
-                # Append schema at the END to highlight expected format
-                system_prompt = f"""{self.SYSTEM_PROMPT}
-
-## Expected JSON Output Format
-
-{schema_str}"""
+                # Schema is appended at the END to highlight expected format
+                system_prompt = self._normal_system_prompt
         
         messages = [
             {"role": "system", "content": system_prompt},
@@ -476,20 +659,105 @@ REMEMBER: Output ONLY valid JSON matching the exact schema. No markdown, no expl
             verbose_print(user_prompt)
             verbose_print("=" * 70)
         
-        response: ChatResponse = chat(
+        # Discovery plans have exactly one option, so start with a small token budget.
+        # If the JSON object is cut off by the token limit, regenerate once with the full budget.
+        initial_num_predict = 512 if (state and state.discovery_mode) else 1024
+        
+        for num_predict in (initial_num_predict, self.MAX_NUM_PREDICT):
+            options = {
+                "temperature": 0 if self.cache else (0.3 if is_retry else 0.7),
+                "num_predict": num_predict,
+            }
+            
+            cache_key = None
+            if self.cache:
+                cache_key = self._cache_key(messages, options)
+                cached = self._read_cached_response(cache_key)
+                if cached is not None:
+                    if is_verbose():
+                        verbose_print(f"[PLANNER] Using cached LLM response: {cache_key[:12]}", prefix="[LLM]")
+                    return cached
+            
+            llm_response, complete, truncated = await self._stream_chat(client, messages, options)
+            
+            if complete:
+                if cache_key:
+                    self._write_cached_response(cache_key, llm_response)
+                break
+            
+            # Prose or malformed output won't improve with more tokens; leave it to the parser
+            if not truncated:
+                break
+            
+            if is_verbose() and num_predict < self.MAX_NUM_PREDICT:
+                verbose_print(f"[PLANNER] Response truncated at num_predict={num_predict}, retrying with {self.MAX_NUM_PREDICT}", prefix="[LLM]")
+        
+        return llm_response
+    
+    async def _stream_chat(self, client: "AsyncClient", messages: List[Dict[str, str]], options: Dict[str, Any]) -> Tuple[str, bool, bool]:
+        """
+        Stream a chat completion, stopping as soon as the top-level JSON object closes.
+        
+        num_predict in options remains the hard cap on generated tokens.
+        
+        Returns:
+            Tuple of (response content, whether the JSON object was closed,
+            whether an opened object was cut off by the num_predict limit)
+        """
+        stream = await client.chat(
             model=self.model,
             messages=messages,
             format="json",
-            options={
-                "temperature": 0.3 if is_retry else 0.7,
-                "num_predict": 2048,
-            }
+            options=options,
+            keep_alive=self.keep_alive,
+            stream=True
         )
         
-        llm_response = response['message']['content']
-        
-        
-        return llm_response
+        content_parts = []
+        tracker = _JsonObjectTracker()
+        complete = False
+        done_reason = None
+        try:
+            async for chunk in stream:
+                text = chunk['message']['content']
+                content_parts.append(text)
+                if tracker.feed(text):
+                    complete = True
+                    break
+                done_reason = chunk.get('done_reason') or done_reason
+        finally:
+            await stream.aclose()
+        
+        truncated = not complete and tracker.started and done_reason == "length"
+        return "".join(content_parts), complete, truncated
+    
+    def _cache_key(self, messages: List[Dict[str, str]], options: Dict[str, Any]) -> str:
+        """Hash the model, messages and options into a response cache key."""
+        payload = json.dumps({"m": self.model, "msgs": messages, "opts": options}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _read_cached_response(self, cache_key: str) -> Optional[str]:
+        """Return the cached response content, or None if missing or stale."""
+        cache_file = self._cache_dir / f"{cache_key}.json"
+        try:
+            if time.time() - cache_file.stat().st_mtime > self.cache_max_age:
+                return None
+            with open(cache_file, 'r') as f:
+                return json.load(f)["content"]
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _write_cached_response(self, cache_key: str, content: str) -> None:
+        """Atomically write a response to the cache (failures are non-fatal)."""
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"model": self.model, "content": content}, f)
+            os.replace(tmp_path, self._cache_dir / f"{cache_key}.json")
+        except OSError as e:
+            if is_verbose():
+                verbose_print(f"[PLANNER] Failed to write response cache: {e}", prefix="[LLM]")
     
     def _create_fallback_plan(self, error: str, response: str) -> FirmwareConfigPlan:
         """
@@ -502,10 +770,8 @@ REMEMBER: Output ONLY valid JSON matching the exact schema. No markdown, no expl
         Returns:
             A minimal fallback firmware plan object
         """
-        import uuid
-        
         fallback_data = {
-            "id": f"fw_plan_{uuid.uuid4().hex[:8]}",
+            "id": f"fw_plan_{secrets.token_hex(4)}",
             "objectives": ["⚠️ Parse error - manual intervention needed"],
             "options": [
                 {
@@ -520,7 +786,7 @@ REMEMBER: Output ONLY valid JSON matching the exact schema. No markdown, no expl
         }
         
         try:
-            return self.plan_schema(**fallback_data)
+            return self.plan_schema.model_validate(fallback_data)
         except Exception:
             # If even the fallback fails, return the dict itself
             return fallback_data
@@ -529,9 +795,14 @@ REMEMBER: Output ONLY valid JSON matching the exact schema. No markdown, no expl
         """LangGraph node interface - callable that updates state."""
         plan = self.plan(state)
         return {"plan": plan}
+    
+    async def acall(self, state: State) -> Dict[str, Any]:
+        """Async LangGraph node interface - awaits the plan on the caller's event loop."""
+        plan = await self._plan_async(state)
+        return {"plan": plan}
 
 # Convenience function for workflow integration
-def create_firmware_planner(model: str = "llama3.3:latest", kb_path: Optional[Path] = None) -> FirmwarePlannerAgent:
+def create_firmware_planner(model: str = "llama3.3:latest", kb_path: Optional[Path] = None, keep_alive: str = "30m") -> FirmwarePlannerAgent:
     """Create a firmware-specific planner instance."""
-    return FirmwarePlannerAgent(model, kb_path=kb_path)
+    return FirmwarePlannerAgent(model, kb_path=kb_path, keep_alive=keep_alive)
 
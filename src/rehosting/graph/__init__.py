@@ -1,6 +1,16 @@
 """LangGraph workflow for multi-agent firmware rehosting."""
 
-from .langgraph_workflow import create_rehosting_workflow, RehostingWorkflow
+__all__ = ["create_rehosting_workflow", "RehostingWorkflow", "WorkflowConfig"]
 
-__all__ = ["create_rehosting_workflow", "RehostingWorkflow"]
 
+def __getattr__(name):
+    # Defer importing LangGraph (and the agents' ollama/pydantic deps) until first use
+    if name in __all__:
+        from .langgraph_workflow import create_rehosting_workflow, RehostingWorkflow, WorkflowConfig
+        globals().update(
+            create_rehosting_workflow=create_rehosting_workflow,
+            RehostingWorkflow=RehostingWorkflow,
+            WorkflowConfig=WorkflowConfig,
+        )
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,84 @@
+"""
+Background writer for engineer action records.
+
+Action records are appended to a JSONL log by a daemon thread so that
+option branches don't block on disk I/O while the workflow is running.
+"""
+
+from pathlib import Path
+from typing import Any, Optional
+import json
+import queue
+import threading
+
+from src.settings import is_verbose, verbose_print
+
+
+class AsyncActionWriter:
+    """
+    Append action records to a JSONL file from a background thread.
+    
+    Records are queued with write(); flush() blocks until everything queued
+    so far is on disk, and close() flushes and stops the thread.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, path: Path):
+        """
+        Initialize the writer and start its background thread.
+        
+        Args:
+            path: JSONL file to append action records to
+        """
+        self.path = Path(path)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread = threading.Thread(target=self._drain, name="action-writer", daemon=True)
+        self._thread.start()
+    
+    def write(self, record: Any) -> None:
+        """Queue an action record (ActionRecord or dict) for writing."""
+        self._queue.put(record)
+    
+    def flush(self) -> None:
+        """Block until all queued records have been written."""
+        self._queue.join()
+    
+    def close(self) -> None:
+        """Flush pending records and stop the background thread."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+    
+    def _drain(self) -> None:
+        """Background loop: write queued records until the stop sentinel arrives."""
+        f = self._open()
+        try:
+            while True:
+                record = self._queue.get()
+                try:
+                    if record is self._STOP:
+                        return
+                    if f is not None:
+                        data = record.to_dict() if hasattr(record, "to_dict") else record
+                        f.write(json.dumps(data, default=str) + "\n")
+                        if self._queue.empty():
+                            f.flush()
+                except Exception as e:
+                    print(f"[WORKFLOW] Warning: Failed to write action record: {e}")
+                finally:
+                    self._queue.task_done()
+        finally:
+            if f is not None:
+                f.close()
+    
+    def _open(self) -> Optional[Any]:
+        """Open the log file for appending, or return None if it can't be opened."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            f = open(self.path, "a")
+        except OSError as e:
+            print(f"[WORKFLOW] Warning: Cannot open action log {self.path}: {e}")
+            return None
+        if is_verbose():
+            verbose_print(f"Writing action records to {self.path}", prefix="[WORKFLOW]")
+        return f
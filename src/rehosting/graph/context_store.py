@@ -0,0 +1,36 @@
+"""
+In-process store for large read-only workflow inputs.
+
+The workflow state carries only a handle to values such as the Penguin
+results context, so LangGraph never copies or serializes them between
+supersteps.
+"""
+
+from typing import Any, Dict
+import threading
+import uuid
+
+
+class ContextStore:
+    """Thread-safe mapping from opaque handles to stored values."""
+    
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def put(self, value: Any) -> str:
+        """Store a value and return its handle."""
+        key = uuid.uuid4().hex
+        with self._lock:
+            self._data[key] = value
+        return key
+    
+    def get(self, key: str) -> Any:
+        """Return the value stored under a handle (KeyError if unknown)."""
+        with self._lock:
+            return self._data[key]
+    
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Remove and return the value stored under a handle."""
+        with self._lock:
+            return self._data.pop(key, default)
@@ -4,18 +4,80 @@ LangGraph workflow for coordinating Planner and Engineer agents.
 This workflow orchestrates the multi-agent system where:
 1. Planner analyzes results and generates configuration update plans
 2. Plans are automatically approved (for now - can add Evaluator later)
-3. Engineer executes the approved plan options in sequence
+3. Engineer executes the approved plan options (one Send per option; the LLM
+   calls overlap, config changes are applied in priority order)
+4. Engineer finalize step merges the results and reports config changes
 """
 
+import asyncio
 import configparser
+from dataclasses import dataclass, fields
+import logging
+import threading
 from pathlib import Path
-from typing import Dict, Any, TypedDict, Annotated, Sequence
+from typing import Dict, Any, List, Mapping, Optional, Tuple, TypedDict, Annotated, Sequence, Union
 import operator
 
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
 from src.rehosting.agents import FirmwarePlannerAgent, EngineerAgent
+from src.rehosting.graph.async_writer import AsyncActionWriter
+from src.rehosting.graph.context_store import ContextStore
+from src.rehosting.llm_cache import canonical_prompt, config_fingerprint, get_result_cache
 from src.rehosting.schemas import State, ActionRecord
-from src.settings import is_verbose, verbose_print
+from src.settings import configure_logger, is_verbose
+
+logger = logging.getLogger("rehosting.workflow")
+
+
+@dataclass(frozen=True, slots=True)
+class WorkflowConfig:
+    """Workflow settings parsed once from config.ini."""
+    
+    model: str = "llama3.3:latest"
+    keep_alive: str = "30m"
+    warmup: bool = True
+    kb_enabled: bool = True
+    kb_path: Optional[Path] = None
+    kb_embedding_model: str = ""
+    kb_similarity_threshold: float = 0.8
+    max_options: int = 3
+    max_iterations: int = 10
+    cache_enabled: bool = False
+    response_cache_enabled: bool = False
+    response_cache_dir: Optional[Path] = None
+    response_cache_max_age: float = 24 * 3600
+    
+    @classmethod
+    def from_configparser(cls, config: configparser.ConfigParser) -> "WorkflowConfig":
+        """
+        Parse workflow settings from config.ini.
+        
+        Args:
+            config: Configuration from config.ini
+            
+        Returns:
+            WorkflowConfig with defaults for missing options
+        """
+        # Slotted dataclasses don't keep field defaults as class attributes
+        defaults = {f.name: f.default for f in fields(cls)}
+        kb_path_str = config.get('KnowledgeBase', 'path', fallback='').strip()
+        response_cache_dir_str = config.get('Cache', 'responses_dir', fallback='').strip()
+        return cls(
+            model=config.get('Ollama', 'model', fallback=defaults['model']),
+            keep_alive=config.get('Ollama', 'keep_alive', fallback=defaults['keep_alive']),
+            warmup=config.getboolean('Ollama', 'warmup', fallback=defaults['warmup']),
+            kb_enabled=config.getboolean('KnowledgeBase', 'enabled', fallback=defaults['kb_enabled']),
+            kb_path=Path(kb_path_str) if kb_path_str else None,
+            kb_embedding_model=config.get('KnowledgeBase', 'embedding_model', fallback='').strip(),
+            kb_similarity_threshold=config.getfloat('KnowledgeBase', 'similarity_threshold', fallback=defaults['kb_similarity_threshold']),
+            max_options=config.getint('Engineer', 'max_options', fallback=defaults['max_options']),
+            max_iterations=config.getint('Penguin', 'max_iter', fallback=defaults['max_iterations']),
+            cache_enabled=config.getboolean('Cache', 'enabled', fallback=defaults['cache_enabled']),
+            response_cache_enabled=config.getboolean('Cache', 'responses', fallback=defaults['response_cache_enabled']),
+            response_cache_dir=Path(response_cache_dir_str).expanduser() if response_cache_dir_str else None,
+            response_cache_max_age=config.getfloat('Cache', 'responses_max_age', fallback=defaults['response_cache_max_age']),
+        )
 
 
 class RehostingState(TypedDict):
@@ -27,7 +89,7 @@ class RehostingState(TypedDict):
     # Base fields from State
     goal: str
     plan: Any  # FirmwareConfigPlan
-    rag_context: dict[str, str]  # Changed from list to dict (key=source, value=content)
+    rag_context_id: str  # Handle into the workflow's ContextStore (context dict: key=source, value=content)
     budget: dict[str, Any]
     done: bool
     
@@ -37,8 +99,9 @@ class RehostingState(TypedDict):
     
     # Execution tracking
     actions: Annotated[Sequence[ActionRecord], operator.add]  # Append-only list
-    engineer_summary: list[dict]
+    engineer_summary: Annotated[list[dict], operator.add]  # Append-only, merged across option branches
     execution_complete: bool
+    action_log_path: str  # JSONL log of action records (written in the background)
     
     # Discovery mode tracking
     discovery_mode: bool
@@ -54,8 +117,10 @@ class RehostingWorkflow:
     
     Workflow:
     1. START → Planner
-    2. Planner → Engineer (plan is automatically approved)
-    3. Engineer → END (after executing all options)
+    2. Planner → Engineer option nodes (plan is automatically approved,
+       one concurrent branch per selected option via Send; changes are
+       still applied in priority order)
+    3. Engineer options → Engineer finalize → END
     
     Future extensions:
     - Add Evaluator node between Planner and Engineer
@@ -65,60 +130,108 @@ class RehostingWorkflow:
     
     def __init__(
         self,
-        config: configparser.ConfigParser,
+        config: Union["WorkflowConfig", configparser.ConfigParser],
         project_path: Path,
-        verbose: bool = False
+        verbose: bool = False,
+        action_writer: Optional[AsyncActionWriter] = None
     ):
         """
         Initialize the rehosting workflow.
         
         Args:
-            config: Configuration from config.ini
+            config: Parsed workflow configuration (a ConfigParser is converted)
             project_path: Path to the Penguin project
             verbose: Enable verbose logging
+            action_writer: Action log writer shared across workflows (owned and
+                closed by the caller); if None, each run uses its own writer
         """
+        # Parse config.ini once; later reads are plain attribute loads
+        if isinstance(config, configparser.ConfigParser):
+            config = WorkflowConfig.from_configparser(config)
         self.config = config
         self.project_path = project_path
         self.verbose = verbose
+        # Workflow debug messages use the same format as verbose_print
+        configure_logger(logger, "[VERBOSE] [WORKFLOW]", verbose or is_verbose())
         
         # Initialize agents with shared knowledge base (if enabled)
-        model = config.get('Ollama', 'model', fallback='llama3.3:latest')
-        
-        # Check if KB is enabled in config
-        kb_enabled = config.getboolean('KnowledgeBase', 'enabled', fallback=True) if config.has_section('KnowledgeBase') else True
-        kb_path = None
-        
-        if kb_enabled:
-            # Get custom KB path if specified
-            if config.has_option('KnowledgeBase', 'path'):
-                kb_path_str = config.get('KnowledgeBase', 'path')
-                if kb_path_str and kb_path_str.strip():
-                    kb_path = Path(kb_path_str)
-            
-            if is_verbose():
-                verbose_print("Knowledge Base: ENABLED", prefix="[WORKFLOW]")
-                if kb_path:
-                    verbose_print(f"  Custom KB path: {kb_path}", prefix="[WORKFLOW]")
-                else:
-                    verbose_print("  Using built-in KB", prefix="[WORKFLOW]")
+        kb_path = config.kb_path if config.kb_enabled else None
+        if config.kb_enabled:
+            logger.debug("Knowledge Base: ENABLED")
+            if kb_path:
+                logger.debug("  Custom KB path: %s", kb_path)
+            else:
+                logger.debug("  Using built-in KB")
         else:
-            if is_verbose():
-                verbose_print("Knowledge Base: DISABLED", prefix="[WORKFLOW]")
+            logger.debug("Knowledge Base: DISABLED")
+        
+        self.planner = FirmwarePlannerAgent(
+            model=config.model,
+            kb_path=kb_path,
+            keep_alive=config.keep_alive,
+            cache=config.response_cache_enabled,
+            cache_dir=config.response_cache_dir,
+            cache_max_age=config.response_cache_max_age
+        )
         
-        # Get engineer configuration
-        max_options = config.getint('Engineer', 'max_options', fallback=3) if config.has_section('Engineer') else 3
+        # Optional embedding similarity matching in the KB (shared instance)
+        if config.kb_enabled and config.kb_embedding_model and self.planner.kb is not None:
+            self.planner.kb.enable_embeddings(config.kb_embedding_model, threshold=config.kb_similarity_threshold)
         
-        self.planner = FirmwarePlannerAgent(model=model, kb_path=kb_path if kb_enabled else None)
         self.engineer = EngineerAgent(
             project_path=project_path, 
-            model=model, 
-            kb_path=kb_path if kb_enabled else None,
-            max_options=max_options
+            model=config.model, 
+            kb_path=kb_path,
+            max_options=config.max_options
         )
         
+        # Read-only run inputs kept out of the graph state
+        self._ctx = ContextStore()
+        
+        # Action log writer (the caller's shared writer, or one created per run)
+        self._shared_writer = action_writer
+        self.action_writer = action_writer
+        self.action_log_path = action_writer.path if action_writer is not None else project_path / "actions.jsonl"
+        
+        # Exact-match cache for planner results (shared across iterations)
+        self.cache = None
+        self.cache_namespace = f"planner:{config.model}"
+        if config.cache_enabled:
+            self.cache = get_result_cache()
+            logger.debug("Planner cache: ENABLED")
+        if config.response_cache_enabled:
+            logger.debug("Planner response cache: ENABLED (%s)", self.planner._cache_dir)
+        
         # Build the graph
         self.graph = self._build_graph()
         self.app = self.graph.compile()
+        
+        # Load the LLM in the background while Penguin results are prepared
+        self.model = config.model
+        self.keep_alive = config.keep_alive
+        self._warmup_thread = None
+        if config.warmup:
+            self._warmup_thread = threading.Thread(target=self._warmup, name="ollama-warmup", daemon=True)
+            self._warmup_thread.start()
+    
+    def _warmup(self):
+        """
+        Force Ollama to load the models so the first planner call doesn't pay the load time.
+        
+        An empty generate request loads the model without producing tokens;
+        keep_alive keeps it resident for the following agent calls.
+        """
+        try:
+            from ollama import generate
+            generate(model=self.model, prompt="", keep_alive=self.keep_alive)
+            if self.planner.kb is not None:
+                # Reads external KB files, then batch-embeds (or loads persisted) symptom embeddings if enabled
+                self.planner.kb.load()
+                self.planner.kb.symptom_embeddings()
+            logger.debug("Warmed up model %s", self.model)
+        except Exception as e:
+            # Warm-up is best effort; the first real call will load the model instead
+            logger.debug("Model warm-up failed: %s", e)
     
     def _build_graph(self) -> StateGraph:
         """
@@ -132,28 +245,35 @@ class RehostingWorkflow:
         
         # Add nodes
         workflow.add_node("planner", self._planner_node)
-        workflow.add_node("engineer", self._engineer_node)
+        workflow.add_node("engineer_option", self._engineer_option_node)
+        workflow.add_node("engineer_finalize", self._engineer_finalize_node)
         
         # Define edges
         workflow.set_entry_point("planner")
         
-        # Planner → Engineer (automatic approval for now)
-        workflow.add_edge("planner", "engineer")
+        # Planner → one engineer_option branch per option (automatic approval for now)
+        workflow.add_conditional_edges(
+            "planner",
+            self._dispatch_options,
+            ["engineer_option", "engineer_finalize"]
+        )
+        
+        # All option branches join before finalizing
+        workflow.add_edge("engineer_option", "engineer_finalize")
         
-        # Engineer → END
-        workflow.add_edge("engineer", END)
+        # Engineer finalize → END
+        workflow.add_edge("engineer_finalize", END)
         
-        if is_verbose():
-            verbose_print("=" * 70)
-            verbose_print("WORKFLOW: GRAPH BUILT", prefix="[WORKFLOW]")
-            verbose_print("=" * 70)
-            verbose_print("Nodes: planner, engineer", prefix="[WORKFLOW]")
-            verbose_print("Flow: START → planner → engineer → END", prefix="[WORKFLOW]")
-            verbose_print("=" * 70)
+        logger.debug("=" * 70)
+        logger.debug("WORKFLOW: GRAPH BUILT")
+        logger.debug("=" * 70)
+        logger.debug("Nodes: planner, engineer_option, engineer_finalize")
+        logger.debug("Flow: START → planner → engineer_option (xN) → engineer_finalize → END")
+        logger.debug("=" * 70)
         
         return workflow
     
-    def _planner_node(self, state: RehostingState) -> Dict[str, Any]:
+    async def _planner_node(self, state: RehostingState) -> Dict[str, Any]:
         """
         Planner node - generates configuration update plan.
         
@@ -163,86 +283,165 @@ class RehostingWorkflow:
         Returns:
             State updates with the generated plan
         """
-        if is_verbose():
-            verbose_print("=" * 70)
-            verbose_print("NODE: PLANNER", prefix="[WORKFLOW]")
-            verbose_print("=" * 70)
+        logger.debug("=" * 70)
+        logger.debug("NODE: PLANNER")
+        logger.debug("=" * 70)
         
         print("\n" + "=" * 70)
         print("🧠 PLANNER: Analyzing results and generating plan...")
         print("=" * 70)
         
-        # Convert to State object for planner, including previous execution context
+        # Convert to State object for planner, including previous execution context.
         planner_state = State(
             goal=state["goal"],
-            rag_context=state["rag_context"],
+            rag_context=self._ctx.get(state["rag_context_id"]),
             budget=state["budget"],
             project_path=state.get("project_path"),
             discovery_mode=state.get("discovery_mode", False),
-            discovery_variable=state.get("discovery_variable")
+            discovery_variable=state.get("discovery_variable"),
+            previous_actions=state.get("actions") or [],
+            previous_engineer_summary=state.get("engineer_summary") or None
         )
         
-        # Add previous execution context for learning from past iterations
-        if state.get("actions"):
-            planner_state.previous_actions = state["actions"]
-        if state.get("engineer_summary"):
-            planner_state.previous_engineer_summary = state["engineer_summary"]
+        # Call planner (returns {"plan": plan_object}), reusing a cached plan if possible
+        updates, cache_key = await asyncio.to_thread(self._cached_plan, planner_state)
+        if updates is None:
+            updates = await self.planner.acall(planner_state)
+            self._store_plan(updates, cache_key)
         
-        # Call planner (returns {"plan": plan_object})
-        updates = self.planner(planner_state)
-        
-        if is_verbose():
-            verbose_print("Planner returned updates", prefix="[WORKFLOW]")
-            verbose_print(f"Plan ID: {updates.get('plan').id if updates.get('plan') else 'None'}", prefix="[WORKFLOW]")
+        logger.debug("Planner returned updates")
+        logger.debug("Plan ID: %s", updates["plan"].id if updates.get("plan") else None)
         
         return updates
     
-    def _engineer_node(self, state: RehostingState) -> Dict[str, Any]:
+    def _cached_plan(self, planner_state: State) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
-        Engineer node - executes the plan options in sequence.
+        Look up a planner result for identical inputs in the result cache.
         
         Args:
-            state: Current workflow state
+            planner_state: State passed to the planner
             
         Returns:
-            State updates with execution results
+            Tuple of (copy of the cached planner updates or None, cache key)
         """
-        if is_verbose():
-            verbose_print("=" * 70)
-            verbose_print("NODE: ENGINEER", prefix="[WORKFLOW]")
-            verbose_print("=" * 70)
+        if self.cache is None:
+            return None, None
+        
+        prompt = canonical_prompt(planner_state, config_fingerprint(planner_state.project_path))
+        cache_key = self.cache.exact_key(prompt, self.cache_namespace)
+        
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print("♻️  Reusing cached plan for identical inputs")
+        return cached, cache_key
+    
+    def _store_plan(self, updates: Dict[str, Any], cache_key: Optional[str]) -> None:
+        """Store planner updates in the result cache (no-op if caching is disabled)."""
+        if self.cache is None or cache_key is None or not updates.get("plan"):
+            return
+        self.cache.put(cache_key, updates)
+    
+    def _dispatch_options(self, state: RehostingState) -> Union[List[Send], str]:
+        """
+        Fan out the selected plan options to concurrent engineer_option branches.
+        
+        Args:
+            state: Current workflow state (after the planner)
+            
+        Returns:
+            One Send per option to execute, or "engineer_finalize" if there is nothing to run
+        """
+        plan = state.get("plan")
+        if not plan:
+            return "engineer_finalize"
         
         print("\n" + "=" * 70)
         print("🔧 ENGINEER: Executing configuration updates...")
         print("=" * 70)
         
-        # Call engineer (returns {"actions": [...], "engineer_summary": [...], ...})
-        updates = self.engineer(state)
+        options = self.engineer.start_plan(plan, discovery_mode=state.get("discovery_mode", False))
+        if not options:
+            return "engineer_finalize"
         
-        if is_verbose():
-            verbose_print("Engineer returned updates", prefix="[WORKFLOW]")
-            verbose_print(f"Actions: {len(updates.get('actions', []))}", prefix="[WORKFLOW]")
-            verbose_print(f"Complete: {updates.get('execution_complete', False)}", prefix="[WORKFLOW]")
+        logger.debug("Dispatching %d options to engineer", len(options))
         
-        # Mark workflow as done
-        updates["done"] = True
+        return [
+            Send("engineer_option", {"option": option, "index": i, "total": len(options)})
+            for i, option in enumerate(options, 1)
+        ]
+    
+    async def _engineer_option_node(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Engineer option node - executes a single plan option.
         
-        return updates
+        Args:
+            payload: Send payload with "option", "index" and "total"
+            
+        Returns:
+            State updates with the option's action record and summary (merged by reducers)
+        """
+        logger.debug("=" * 70)
+        logger.debug("NODE: ENGINEER OPTION %d/%d", payload["index"], payload["total"])
+        logger.debug("=" * 70)
+        
+        outcome = await self.engineer.aexecute_option(payload["option"], payload["index"], payload["total"])
+        
+        # Persist the record off the hot path; state keeps it for this iteration's consumers
+        if self.action_writer is not None:
+            self.action_writer.write(outcome["action_record"])
+        
+        return {
+            "actions": [outcome["action_record"]],
+            "engineer_summary": [outcome["summary"]]
+        }
     
-    def run(
+    def _engineer_finalize_node(self, state: RehostingState) -> Dict[str, Any]:
+        """
+        Engineer finalize node - reports merged results and closes the cycle.
+        
+        Args:
+            state: Current workflow state (all option branches merged)
+            
+        Returns:
+            State updates marking execution complete
+        """
+        logger.debug("=" * 70)
+        logger.debug("NODE: ENGINEER FINALIZE")
+        logger.debug("=" * 70)
+        
+        if not state.get("plan"):
+            print("[Engineer] Warning: No plan provided, skipping execution")
+            return {
+                "discovery_mode": False,  # Exit discovery mode if we were in it
+                "done": True
+            }
+        
+        self.engineer.finish_plan(state.get("engineer_summary", []))
+        
+        logger.debug("Actions: %d", len(state.get("actions", [])))
+        
+        # Always exit discovery mode after engineer executes; mark workflow as done
+        return {
+            "execution_complete": True,
+            "discovery_mode": False,
+            "discovery_variable": "",
+            "done": True
+        }
+    
+    async def arun(
         self,
         firmware_path: str,
-        rag_context: dict[str, str],
+        rag_context: Mapping[str, str],
         goal: str = "Analyze Penguin rehosting results and generate configuration update plan",
         discovery_mode: bool = False,
         discovery_variable: str = None
     ) -> Dict[str, Any]:
         """
-        Run the complete workflow.
+        Run the complete workflow on the current event loop.
         
         Args:
             firmware_path: Path to the firmware being rehosted
-            rag_context: Context from Penguin results (dict with source keys)
+            rag_context: Context from Penguin results (read-only mapping with source keys)
             goal: Primary goal for the planner
             discovery_mode: Whether in discovery mode
             discovery_variable: Name of variable being discovered
@@ -254,9 +453,9 @@ class RehostingWorkflow:
         initial_state: RehostingState = {
             "goal": goal,
             "plan": None,
-            "rag_context": rag_context,
+            "rag_context_id": self._ctx.put(rag_context),
             "budget": {
-                "max_iterations": int(self.config.get('Penguin', 'max_iter', fallback=10))
+                "max_iterations": self.config.max_iterations
             },
             "done": False,
             "firmware_path": firmware_path,
@@ -264,20 +463,20 @@ class RehostingWorkflow:
             "actions": [],
             "engineer_summary": [],
             "execution_complete": False,
+            "action_log_path": str(self.action_log_path),
             "discovery_mode": discovery_mode,
             "discovery_variable": discovery_variable or "",
             "errors": []
         }
         
-        if is_verbose():
-            verbose_print("=" * 70)
-            verbose_print("WORKFLOW: STARTING", prefix="[WORKFLOW]")
-            verbose_print("=" * 70)
-            verbose_print(f"Firmware: {firmware_path}", prefix="[WORKFLOW]")
-            verbose_print(f"Project: {self.project_path}", prefix="[WORKFLOW]")
-            verbose_print(f"Goal: {goal}", prefix="[WORKFLOW]")
-            verbose_print(f"Context sources: {list(rag_context.keys())}", prefix="[WORKFLOW]")
-            verbose_print("=" * 70)
+        logger.debug("=" * 70)
+        logger.debug("WORKFLOW: STARTING")
+        logger.debug("=" * 70)
+        logger.debug("Firmware: %s", firmware_path)
+        logger.debug("Project: %s", self.project_path)
+        logger.debug("Goal: %s", goal)
+        logger.debug("Context sources: %s", rag_context.keys())
+        logger.debug("=" * 70)
         
         print("\n" + "=" * 70)
         print("🚀 MULTI-AGENT WORKFLOW: Starting")
@@ -286,19 +485,49 @@ class RehostingWorkflow:
         print(f"Project: {self.project_path}")
         print("=" * 70)
         
-        # Run the graph
-        final_state = self.app.invoke(initial_state)
+        # Give the warm-up a moment to finish so the first LLM call hits a loaded model
+        if self._warmup_thread is not None:
+            await asyncio.to_thread(self._warmup_thread.join, 5)
         
-        if is_verbose():
-            verbose_print("=" * 70)
-            verbose_print("WORKFLOW: COMPLETED", prefix="[WORKFLOW]")
-            verbose_print("=" * 70)
-            verbose_print(f"Done: {final_state.get('done', False)}", prefix="[WORKFLOW]")
-            verbose_print(f"Total actions: {len(final_state.get('actions', []))}", prefix="[WORKFLOW]")
-            verbose_print("=" * 70)
+        # Run the graph
+        if self._shared_writer is None:
+            self.action_writer = AsyncActionWriter(self.action_log_path)
+        try:
+            final_state = await self.app.ainvoke(initial_state)
+        finally:
+            # This run's records are on disk once it returns; a shared writer stays open
+            if self.action_writer is self._shared_writer:
+                await asyncio.to_thread(self.action_writer.flush)
+            else:
+                self.action_writer.close()
+                self.action_writer = None
+            self._ctx.pop(initial_state["rag_context_id"])
+        
+        logger.debug("=" * 70)
+        logger.debug("WORKFLOW: COMPLETED")
+        logger.debug("=" * 70)
+        logger.debug("Done: %s", final_state.get("done", False))
+        logger.debug("Total actions: %d", len(final_state.get("actions", [])))
+        logger.debug("=" * 70)
         
         return final_state
     
+    def run(
+        self,
+        firmware_path: str,
+        rag_context: Mapping[str, str],
+        goal: str = "Analyze Penguin rehosting results and generate configuration update plan",
+        discovery_mode: bool = False,
+        discovery_variable: str = None
+    ) -> Dict[str, Any]:
+        """
+        Run the complete workflow (synchronous wrapper around arun).
+        
+        Returns:
+            Final state after workflow completion
+        """
+        return asyncio.run(self.arun(firmware_path, rag_context, goal, discovery_mode, discovery_variable))
+    
     def get_plan(self, state: RehostingState) -> Any:
         """Extract the plan from the workflow state."""
         return state.get("plan")
@@ -313,20 +542,24 @@ class RehostingWorkflow:
 
 
 def create_rehosting_workflow(
-    config: configparser.ConfigParser,
+    config: Union[WorkflowConfig, configparser.ConfigParser],
     project_path: Path,
-    verbose: bool = False
+    verbose: bool = False,
+    action_writer: Optional[AsyncActionWriter] = None
 ) -> RehostingWorkflow:
     """
     Create a rehosting workflow instance.
     
     Args:
-        config: Configuration from config.ini
+        config: Configuration from config.ini, or a WorkflowConfig parsed from it
         project_path: Path to the Penguin project
         verbose: Enable verbose logging
+        action_writer: Action log writer shared across workflows (closed by the caller)
         
     Returns:
         Configured RehostingWorkflow ready to run
     """
-    return RehostingWorkflow(config, project_path, verbose)
+    if isinstance(config, configparser.ConfigParser):
+        config = WorkflowConfig.from_configparser(config)
+    return RehostingWorkflow(config, project_path, verbose, action_writer)
 
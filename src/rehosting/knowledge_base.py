@@ -7,8 +7,41 @@ rehosting problems. Different agents query it for different purposes:
 - Engineer: Tactical information (specific tool calls, parameters, examples)
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sys
+import tempfile
+import threading
+
+from src.settings import configure_logger
+
+log = logging.getLogger(__name__)
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Word tokens used for keyword matching (so "variable:" and "variable" match)
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON, using orjson when available (its JSONDecodeError subclasses json's)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class KnowledgeBase:
@@ -18,6 +51,17 @@ class KnowledgeBase:
     Can be queried by both Planner and Engineer agents for different perspectives.
     """
     
+    __slots__ = (
+        "kb_path", "_issues", "_owns_issues", "_loaded", "_load_lock",
+        # Query indexes and precomputed views (built by _build_index)
+        "_symptom_index", "_objective_index", "_planner_views", "_engineer_views", "_issue_meta",
+        "_issue_order",
+        # Optional embedding matching
+        "embedding_model", "embedding_threshold", "_embedding_cache_dir", "_symptom_vectors", "_embedding_lock",
+        # Memoized queries
+        "_query_for_planner_cached", "_query_for_engineer_cached",
+    )
+    
     # Example knowledge - in real implementation, load from files or vector DB
     COMMON_ISSUES = {
         "missing_env_var_unknown_value": {
@@ -106,52 +150,235 @@ class KnowledgeBase:
         }
     }
     
+    # Precomputed _compute_index(COMMON_ISSUES), set after the class body
+    _BUILTIN_INDEX: Dict[str, Any] = {}
+    
+    # Case detectors in priority order: (predicate over Penguin results, issue_id)
+    _DETECTORS: List[Tuple[Callable[[Dict[str, Any]], bool], str]] = [
+        # env_cmp.txt has candidate values - this is Step 2
+        (lambda d: bool((d.get("env_cmp_txt") or "").strip()), "missing_env_var_found_candidates"),
+        # Missing vars but no candidates yet - this is Step 1
+        (lambda d: bool(d.get("env_missing_yaml")), "missing_env_var_unknown_value"),
+    ]
+    
     def __init__(self, kb_path: Optional[Path] = None):
         """
         Initialize knowledge base.
         
-        Always loads built-in knowledge, then merges with external KB if provided.
+        Always uses built-in knowledge, merged with the external KB if provided.
+        External files are read (and the query indexes built) on first use.
         
         Args:
             kb_path: Path to external KB file or directory containing JSON files
         """
         self.kb_path = kb_path
         
-        # Start with built-in knowledge (always available)
-        self.issues = dict(self.COMMON_ISSUES)
+        # KB messages go to stdout with the [KB] prefix; per-file details only in verbose mode
+        configure_logger(log, "[KB]")
+        
+        # Start with built-in knowledge (always available); copied only when an external issue is merged
+        self._issues: Mapping[str, Any] = self.COMMON_ISSUES
+        self._owns_issues = False
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        
+        # Optional embedding similarity matching (see enable_embeddings)
+        self.embedding_model: Optional[str] = None
+        self.embedding_threshold = 0.8
+        self._embedding_cache_dir = Path.home() / ".cache" / "tinker"
+        self._symptom_vectors: Optional[List[Tuple[str, List[float]]]] = None
+        self._embedding_lock = threading.Lock()
+        
+        # Per-instance memoization of queries (keyed on canonical inputs)
+        self._query_for_planner_cached = lru_cache(maxsize=256)(self._query_for_planner)
+        self._query_for_engineer_cached = lru_cache(maxsize=256)(self._query_for_engineer)
+    
+    def _clear_query_caches(self):
+        """Drop memoized query results after the set of issues changes."""
+        self._query_for_planner_cached.cache_clear()
+        self._query_for_engineer_cached.cache_clear()
+    
+    @property
+    def issues(self) -> Mapping[str, Any]:
+        """All known issues (built-in merged with external), keyed by issue_id."""
+        self._ensure_loaded()
+        return self._issues
+    
+    def load(self):
+        """Load the external KB and build the query indexes now (e.g. from a warm-up thread)."""
+        self._ensure_loaded()
+    
+    def _ensure_loaded(self):
+        """Load and merge the external KB and build the query indexes, once."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            if self.kb_path:
+                self._load_external_kb(self.kb_path)
+            
+            # Token -> issue_id indexes used by the query methods
+            self._build_index()
+            self._loaded = True
+    
+    @staticmethod
+    def _tokenize(*texts: str) -> frozenset:
+        """Lowercase texts and extract their set of word tokens (punctuation is ignored)."""
+        return frozenset(word for text in texts for word in _TOKEN_RE.findall(text.lower()))
+    
+    def _build_index(self):
+        """
+        Set up the query indexes and views for the current issues.
         
-        # Load and merge external KB if path provided
-        if kb_path:
-            self._load_external_kb(kb_path)
+        Without external issues the precomputed built-in index is shared
+        (never mutated after construction); otherwise it is rebuilt.
+        """
+        index = self._BUILTIN_INDEX if not self._owns_issues else self._compute_index(self._issues)
+        for name, value in index.items():
+            setattr(self, name, value)
+    
+    @classmethod
+    def _compute_index(cls, issues: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Build inverted indexes from tokens to issue IDs and precompute query views.
+        
+        Symptoms are indexed for planner queries; title and symptoms together
+        for engineer objective queries. The planner/engineer views (solution view
+        plus issue metadata) are merged once here instead of on every query.
+        
+        Args:
+            issues: Issues keyed by issue_id
+            
+        Returns:
+            Mapping of attribute name to index structure
+        """
+        symptom_index: Dict[str, set] = {}
+        objective_index: Dict[str, set] = {}
+        planner_views: Dict[str, Dict[str, Any]] = {}
+        engineer_views: Dict[str, Dict[str, Any]] = {}
+        issue_meta: Dict[str, Mapping[str, Any]] = {}
+        
+        for issue_id, issue_data in issues.items():
+            # Issue metadata shared by both views (and available via get_issue_metadata)
+            meta = issue_meta[issue_id] = MappingProxyType({
+                "issue_id": issue_id,
+                "title": issue_data["title"],
+                "severity": issue_data["severity"],
+                "symptoms": issue_data["symptoms"]
+            })
+            solutions = issue_data["solutions"]
+            planner_views[issue_id] = {**solutions["planner_view"], **meta}
+            engineer_views[issue_id] = {**solutions["engineer_view"], **meta}
+            
+            # Interned so the many index/posting-list references share one string object per token
+            symptom_tokens = frozenset(map(sys.intern, cls._tokenize(*issue_data["symptoms"])))
+            title_tokens = frozenset(map(sys.intern, cls._tokenize(issue_data["title"])))
+            for token in symptom_tokens:
+                symptom_index.setdefault(token, set()).add(issue_id)
+            for token in symptom_tokens | title_tokens:
+                objective_index.setdefault(token, set()).add(issue_id)
+        
+        return {
+            "_symptom_index": symptom_index,
+            "_objective_index": objective_index,
+            "_planner_views": planner_views,
+            "_engineer_views": engineer_views,
+            "_issue_meta": issue_meta,
+            "_issue_order": {issue_id: i for i, issue_id in enumerate(issues)},
+        }
+    
+    @staticmethod
+    def _lookup(index: Dict[str, set], tokens: frozenset) -> set:
+        """Return the IDs of all issues sharing at least one token with the input."""
+        matched = set()
+        for token in tokens:
+            matched.update(index.get(token, ()))
+        return matched
+    
+    def _in_kb_order(self, issue_ids: set) -> List[str]:
+        """Sort candidate issue IDs into KB order (cost scales with candidates, not KB size)."""
+        return sorted(issue_ids, key=self._issue_order.__getitem__)
     
     def _load_external_kb(self, kb_path: Path):
         """
         Load external knowledge base from file or directory.
         
+        Files in a directory are read and parsed in parallel, then merged in
+        sorted order so overrides between files stay deterministic.
+        
         Args:
-            kb_path: Path to JSON file or directory with JSON files
+            kb_path: Path to JSON file or directory with JSON files (searched recursively)
         """
-        import json
-        
         try:
-            if kb_path.is_file():
+            # scandir classifies the path and its entries (d_type, no per-file stat)
+            try:
+                json_files = sorted(self._scan_json_files(kb_path))
+            except NotADirectoryError:
                 # Load single JSON file
                 self._load_kb_file(kb_path)
-            elif kb_path.is_dir():
-                # Load all JSON files from directory
-                json_files = list(kb_path.glob("*.json"))
-                for json_file in json_files:
-                    self._load_kb_file(json_file)
-                print(f"[KB] Loaded {len(json_files)} external KB files from {kb_path}")
+                return
+            except FileNotFoundError:
+                log.warning("Warning: Path not found: %s", kb_path)
+                return
+            
+            # Load all JSON files from directory (file I/O and orjson parsing release the GIL)
+            if len(json_files) > 1:
+                with ThreadPoolExecutor(max_workers=min(8, len(json_files))) as executor:
+                    parsed = list(executor.map(self._read_kb_file, json_files))
             else:
-                print(f"[KB] Warning: Path not found: {kb_path}")
+                parsed = [self._read_kb_file(json_file) for json_file in json_files]
+            
+            for json_file, external_issues in zip(json_files, parsed):
+                if external_issues is not None:
+                    self._merge_issues(external_issues, json_file)
+            log.info("Loaded %d external KB files from %s", len(json_files), kb_path)
         except Exception as e:
-            print(f"[KB] Error loading external KB: {e}")
+            log.error("Error loading external KB: %s", e)
+    
+    @classmethod
+    def _scan_json_files(cls, directory: Path) -> List[Path]:
+        """
+        Recursively collect *.json files below a directory with os.scandir.
+        
+        Symlinked files are included; symlinked directories are not followed
+        (avoids cycles).
+        
+        Raises:
+            NotADirectoryError: If directory is not a directory
+            FileNotFoundError: If directory does not exist
+        """
+        json_files = []
+        subdirs = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(".json") and entry.is_file():
+                    json_files.append(Path(entry.path))
+        for subdir in subdirs:
+            try:
+                json_files.extend(cls._scan_json_files(subdir))
+            except OSError as e:
+                log.warning("Warning: Cannot read KB directory %s: %s", subdir, e)
+        return json_files
     
     def _load_kb_file(self, file_path: Path):
         """
         Load a single KB JSON file and merge with existing issues.
         
+        Args:
+            file_path: Path to JSON file
+        """
+        external_issues = self._read_kb_file(file_path)
+        if external_issues is not None:
+            self._merge_issues(external_issues, file_path)
+    
+    @staticmethod
+    def _read_kb_file(file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read and parse a single KB JSON file.
+        
         Expected JSON format:
         {
           "issue_id": {
@@ -165,46 +392,185 @@ class KnowledgeBase:
         
         Args:
             file_path: Path to JSON file
+            
+        Returns:
+            Parsed issues, or None if the file could not be read or parsed
         """
-        import json
-        
         try:
-            with open(file_path, 'r') as f:
-                external_issues = json.load(f)
+            with open(file_path, 'rb') as f:
+                return _json_loads(f.read())
+        except json.JSONDecodeError as e:
+            # Also catches orjson.JSONDecodeError (a subclass)
+            log.error("Error parsing JSON in %s: %s", file_path, e)
+        except Exception as e:
+            log.error("Error loading %s: %s", file_path, e)
+        return None
+    
+    @staticmethod
+    def _validate_issue(issue_data: Any) -> Optional[str]:
+        """
+        Check that an external issue has the structure the query paths rely on.
+        
+        Args:
+            issue_data: Parsed issue definition
             
-            # Merge with existing issues
+        Returns:
+            Description of the problem, or None if the issue is valid
+        """
+        if not isinstance(issue_data, dict):
+            return "issue must be a JSON object"
+        for field in ("title", "severity"):
+            if not isinstance(issue_data.get(field), str):
+                return f"'{field}' must be a string"
+        symptoms = issue_data.get("symptoms")
+        if not isinstance(symptoms, list) or not all(isinstance(symptom, str) for symptom in symptoms):
+            return "'symptoms' must be a list of strings"
+        solutions = issue_data.get("solutions")
+        if not isinstance(solutions, dict):
+            return "'solutions' must be a JSON object"
+        for view in ("planner_view", "engineer_view"):
+            if not isinstance(solutions.get(view), dict):
+                return f"'solutions.{view}' must be a JSON object"
+        return None
+    
+    def _merge_issues(self, external_issues: Dict[str, Any], file_path: Path):
+        """Merge parsed external issues over the existing ones, skipping malformed entries."""
+        if not isinstance(external_issues, dict):
+            log.error("Error loading %s: top level must be a JSON object of issues", file_path)
+            return
+        try:
+            # Copy-on-write of the shared built-in mapping
+            if not self._owns_issues:
+                self._issues = dict(self.COMMON_ISSUES)
+                self._owns_issues = True
+            merged = 0
             for issue_id, issue_data in external_issues.items():
-                if issue_id in self.issues:
-                    print(f"[KB] Warning: Overriding built-in issue '{issue_id}' with external definition from {file_path.name}")
-                self.issues[issue_id] = issue_data
+                problem = self._validate_issue(issue_data)
+                if problem:
+                    log.warning("Warning: Skipping issue '%s' from %s: %s", issue_id, file_path.name, problem)
+                    continue
+                issue_id = sys.intern(issue_id)
+                if issue_id in self._issues:
+                    log.warning("Warning: Overriding built-in issue '%s' with external definition from %s", issue_id, file_path.name)
+                self._issues[issue_id] = issue_data
+                merged += 1
+            self._clear_query_caches()
             
-            print(f"[KB] Loaded {len(external_issues)} issues from {file_path.name}")
-        except json.JSONDecodeError as e:
-            print(f"[KB] Error parsing JSON in {file_path}: {e}")
+            log.debug("Loaded %d issues from %s", merged, file_path.name)
+        except Exception as e:
+            log.error("Error loading %s: %s", file_path, e)
+    
+    def enable_embeddings(self, model: str, threshold: float = 0.8, cache_dir: Optional[Path] = None):
+        """
+        Enable embedding similarity matching for planner queries.
+        
+        Issues whose symptoms are semantically close to an observed symptom are
+        returned in addition to keyword matches. Symptom embeddings are computed
+        lazily in one batch request and persisted per (model, KB content).
+        
+        Args:
+            model: Ollama embedding model name
+            threshold: Minimum cosine similarity for a match
+            cache_dir: Directory for persisted embeddings (default: ~/.cache/tinker)
+        """
+        with self._embedding_lock:
+            if model != self.embedding_model:
+                self._symptom_vectors = None
+            self.embedding_model = model
+            self.embedding_threshold = threshold
+            if cache_dir is not None:
+                self._embedding_cache_dir = Path(cache_dir)
+        self._clear_query_caches()
+    
+    @staticmethod
+    def _normalize(vector: List[float]) -> List[float]:
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+    
+    def symptom_embeddings(self) -> List[Tuple[str, List[float]]]:
+        """
+        Get normalized (issue_id, embedding) pairs for all known symptoms.
+        
+        Returns:
+            List of pairs, empty if embeddings are disabled or unavailable
+        """
+        if self.embedding_model is None:
+            return []
+        
+        self._ensure_loaded()
+        with self._embedding_lock:
+            if self._symptom_vectors is None:
+                self._symptom_vectors = self._load_symptom_embeddings(self.embedding_model)
+            return self._symptom_vectors
+    
+    def _load_symptom_embeddings(self, model: str) -> List[Tuple[str, List[float]]]:
+        """Load symptom embeddings from the disk cache, or embed them in one batch request."""
+        entries = [(issue_id, symptom) for issue_id, issue_data in self._issues.items() for symptom in issue_data["symptoms"]]
+        if not entries:
+            return []
+        
+        digest = hashlib.sha256(json.dumps(entries).encode()).hexdigest()[:16]
+        safe_model = re.sub(r'[^\w.-]', '_', model)
+        cache_file = self._embedding_cache_dir / f"kb_embeddings_{safe_model}_{digest}.json"
+        
+        vectors = None
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'r') as f:
+                    vectors = json.load(f)
+            except (OSError, ValueError) as e:
+                log.warning("Warning: Ignoring unreadable embedding cache %s: %s", cache_file, e)
+        
+        if vectors is None or len(vectors) != len(entries):
+            try:
+                from ollama import embed
+                vectors = [list(v) for v in embed(model=model, input=[symptom for _, symptom in entries])["embeddings"]]
+            except Exception as e:
+                log.warning("Warning: Symptom embedding failed, using keyword matching only: %s", e)
+                return []
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(vectors, f)
+                os.replace(tmp_path, cache_file)
+            except OSError as e:
+                log.warning("Warning: Failed to write embedding cache: %s", e)
+        
+        return [(issue_id, self._normalize(vector)) for (issue_id, _), vector in zip(entries, vectors)]
+    
+    def _similar_issues(self, symptoms: Tuple[str, ...]) -> set:
+        """Return IDs of issues with a known symptom similar to any observed symptom."""
+        known = self.symptom_embeddings()
+        if not known or not symptoms:
+            return set()
+        
+        try:
+            from ollama import embed
+            observed = [self._normalize(list(v)) for v in embed(model=self.embedding_model, input=list(symptoms))["embeddings"]]
         except Exception as e:
-            print(f"[KB] Error loading {file_path}: {e}")
+            log.warning("Warning: Symptom embedding failed, using keyword matching only: %s", e)
+            return set()
+        
+        matched = set()
+        for issue_id, vector in known:
+            if issue_id not in matched and any(sum(a * b for a, b in zip(obs, vector)) >= self.embedding_threshold for obs in observed):
+                matched.add(issue_id)
+        return matched
     
     def detect_case(self, results_data: Dict[str, Any]) -> Optional[str]:
         """
         Automatically detect which case applies based on Penguin results.
         
+        Detectors are tried in priority order and the first match wins.
+        
         Args:
             results_data: Dictionary containing Penguin results (env_missing, env_cmp, etc.)
             
         Returns:
             issue_id of the detected case, or None if no match
         """
-        # Check for env_cmp.txt with candidates
-        if results_data.get("env_cmp_txt") and results_data["env_cmp_txt"].strip():
-            # We have candidate values - this is Step 2
-            return "missing_env_var_found_candidates"
-        
-        # Check for missing env vars without candidates
-        if results_data.get("env_missing_yaml"):
-            # We have missing vars but no candidates yet - this is Step 1
-            return "missing_env_var_unknown_value"
-        
-        return None
+        return next((issue_id for detector, issue_id in self._DETECTORS if detector(results_data)), None)
     
     def query_for_planner(self, symptoms: List[str]) -> List[Dict[str, Any]]:
         """
@@ -216,22 +582,32 @@ class KnowledgeBase:
         Returns:
             List of complete planner_view information for matched issues
         """
-        results = []
-        
-        for issue_id, issue_data in self.issues.items():
-            # Check if symptoms match
-            if self._symptoms_match(symptoms, issue_data["symptoms"]):
-                # Return the complete planner_view plus issue metadata
-                planner_view = issue_data["solutions"]["planner_view"].copy()
-                planner_view.update({
-                    "issue_id": issue_id,
-                    "title": issue_data["title"],
-                    "severity": issue_data["severity"],
-                    "symptoms": issue_data["symptoms"]
-                })
-                results.append(planner_view)
-        
-        return results
+        return list(self.iter_planner(symptoms))
+    
+    def iter_planner(self, symptoms: List[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Like query_for_planner, but yields results lazily (cheap for callers that stop early).
+        
+        Args:
+            symptoms: List of observed symptoms/issues
+            
+        Yields:
+            Complete planner_view information for each matched issue
+        """
+        self._ensure_loaded()
+        
+        # Results depend only on the set of symptoms; copy so callers can't mutate the cache
+        for view in self._query_for_planner_cached(tuple(sorted(set(symptoms)))):
+            yield dict(view)
+    
+    def _query_for_planner(self, symptoms: Tuple[str, ...]) -> Tuple[Dict[str, Any], ...]:
+        """Uncached planner query over a canonical (sorted, deduplicated) symptom tuple."""
+        matched = self._lookup(self._symptom_index, self._tokenize(*symptoms))
+        if self.embedding_model is not None:
+            matched |= self._similar_issues(symptoms)
+        
+        # Complete planner_view plus issue metadata, in KB order
+        return tuple(self._planner_views[issue_id] for issue_id in self._in_kb_order(matched))
     
     def query_for_engineer(self, objective: str, issue_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -244,58 +620,32 @@ class KnowledgeBase:
         Returns:
             List of complete engineer_view information for matched issues
         """
-        results = []
+        return list(self.iter_engineer(objective, issue_id))
+    
+    def iter_engineer(self, objective: str, issue_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Like query_for_engineer, but yields results lazily (cheap for callers that stop early).
         
+        Args:
+            objective: High-level objective to implement
+            issue_id: Known issue ID (if available)
+            
+        Yields:
+            Complete engineer_view information for each matched issue
+        """
+        self._ensure_loaded()
+        for view in self._query_for_engineer_cached(objective, issue_id):
+            yield dict(view)
+    
+    def _query_for_engineer(self, objective: str, issue_id: Optional[str]) -> Tuple[Dict[str, Any], ...]:
+        """Uncached engineer query."""
         # If issue_id provided, get specific engineer_view
-        if issue_id and issue_id in self.issues:
-            engineer_view = self.issues[issue_id]["solutions"]["engineer_view"].copy()
-            engineer_view.update({
-                "issue_id": issue_id,
-                "title": self.issues[issue_id]["title"],
-                "severity": self.issues[issue_id]["severity"],
-                "symptoms": self.issues[issue_id]["symptoms"]
-            })
-            return [engineer_view]
+        if issue_id and issue_id in self._engineer_views:
+            return (self._engineer_views[issue_id],)
         
         # Otherwise, search based on objective keywords
-        for issue_id, issue_data in self.issues.items():
-            if self._objective_matches(objective, issue_data):
-                # Return the complete engineer_view plus issue metadata
-                engineer_view = issue_data["solutions"]["engineer_view"].copy()
-                engineer_view.update({
-                    "issue_id": issue_id,
-                    "title": issue_data["title"],
-                    "severity": issue_data["severity"],
-                    "symptoms": issue_data["symptoms"]
-                })
-                results.append(engineer_view)
-        
-        return results
-    
-    def _symptoms_match(self, observed: List[str], known: List[str]) -> bool:
-        """Check if observed symptoms match known symptoms."""
-        # Simple keyword matching (can be improved with embeddings)
-        for obs in observed:
-            for kn in known:
-                if any(word in obs.lower() for word in kn.lower().split()):
-                    return True
-        return False
-    
-    def _objective_matches(self, objective: str, issue_data: Dict[str, Any]) -> bool:
-        """Check if objective relates to this issue."""
-        # Simple keyword matching
-        obj_lower = objective.lower()
-        
-        # Check title
-        if any(word in obj_lower for word in issue_data["title"].lower().split()):
-            return True
-        
-        # Check symptoms
-        for symptom in issue_data["symptoms"]:
-            if any(word in obj_lower for word in symptom.lower().split()):
-                return True
-        
-        return False
+        matched = self._lookup(self._objective_index, self._tokenize(objective))
+        return tuple(self._engineer_views[issue_id] for issue_id in self._in_kb_order(matched))
     
     def get_all_issues(self) -> List[str]:
         """Get list of all known issue IDs."""
@@ -305,6 +655,11 @@ class KnowledgeBase:
         """Get complete details for a specific issue."""
         return self.issues.get(issue_id)
     
+    def get_issue_metadata(self, issue_id: str) -> Optional[Mapping[str, Any]]:
+        """Get read-only metadata (issue_id, title, severity, symptoms) for an issue."""
+        self._ensure_loaded()
+        return self._issue_meta.get(issue_id)
+    
     def get_kb_stats(self) -> Dict[str, Any]:
         """Get statistics about the loaded knowledge base."""
         built_in_count = len(self.COMMON_ISSUES)
@@ -319,13 +674,28 @@ class KnowledgeBase:
         }
 
 
-# Global instance (can be configured per workflow)
-_default_kb = None
+# Built-in issues are shared by every instance; expose them read-only
+KnowledgeBase.COMMON_ISSUES = MappingProxyType({
+    issue_id: MappingProxyType(issue_data) for issue_id, issue_data in KnowledgeBase.COMMON_ISSUES.items()
+})
+
+# Derived index for the built-in issues, computed once at import
+KnowledgeBase._BUILTIN_INDEX = KnowledgeBase._compute_index(KnowledgeBase.COMMON_ISSUES)
+
+
+# Global state (can be configured per workflow)
 _kb_disabled = False
+_kb_instances: Dict[Optional[str], KnowledgeBase] = {}
+_kb_lock = threading.Lock()
+
 
 def get_knowledge_base(kb_path: Optional[Path] = None) -> Optional[KnowledgeBase]:
     """
-    Get or create the default knowledge base instance.
+    Get or create the shared knowledge base instance for a KB path.
+    
+    Instances are cached per resolved path, so agents created with the same
+    path share a single KnowledgeBase. Creation is guarded by a lock so
+    concurrent agents never load the same KB twice.
     
     Args:
         kb_path: Path to custom KB file, or None to use built-in KB
@@ -333,7 +703,7 @@ def get_knowledge_base(kb_path: Optional[Path] = None) -> Optional[KnowledgeBase
     Returns:
         KnowledgeBase instance if enabled, None if disabled
     """
-    global _default_kb, _kb_disabled
+    global _kb_disabled
     
     # If kb_path is explicitly False, disable KB
     if kb_path is False:
@@ -343,7 +713,14 @@ def get_knowledge_base(kb_path: Optional[Path] = None) -> Optional[KnowledgeBase
     if _kb_disabled:
         return None
     
-    if _default_kb is None:
-        _default_kb = KnowledgeBase(kb_path)
-    return _default_kb
-
+    key = str(Path(kb_path).resolve()) if kb_path else None
+    
+    # Fast path without the lock, then re-check under it before loading
+    kb = _kb_instances.get(key)
+    if kb is None:
+        with _kb_lock:
+            kb = _kb_instances.get(key)
+            if kb is None:
+                kb = KnowledgeBase(Path(key) if key else None)
+                _kb_instances[key] = kb
+    return kb
@@ -0,0 +1,119 @@
+"""
+Exact-match plan cache for LLM-backed agent results.
+
+Stores agent results under a SHA-256 key over the canonical agent input, so
+that an identical input (same goal, Penguin results, previous actions and
+config.yaml) in a later iteration reuses the previous result instead of
+running the LLM again. Only exact matches are reused: a plan generated for a
+different config.yaml or action history may no longer apply.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+import copy
+import hashlib
+import json
+import threading
+
+from src.rehosting.schemas import State
+
+
+def config_fingerprint(project_path: Optional[str]) -> str:
+    """
+    SHA-256 of the project's config.yaml bytes.
+    
+    Args:
+        project_path: Path to the Penguin project (None if unknown)
+    
+    Returns:
+        Hex digest, or "" if there is no project or config.yaml
+    """
+    if not project_path:
+        return ""
+    try:
+        return hashlib.sha256((Path(project_path) / "config.yaml").read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def _as_plain(value: Any) -> Any:
+    """Convert action records to dicts so they serialize deterministically."""
+    return value.to_dict() if hasattr(value, "to_dict") else value
+
+
+def canonical_prompt(state: State, config_fp: str = "") -> str:
+    """
+    Build a stable text representation of the planner inputs used as the cache key.
+    
+    Args:
+        state: State passed to the planner
+        config_fp: Fingerprint of the project's config.yaml (see config_fingerprint)
+    
+    Returns:
+        Canonical text covering every input that affects the plan
+    """
+    parts = [
+        f"goal: {state.goal}",
+        f"discovery_mode: {bool(state.discovery_mode)}",
+        f"discovery_variable: {state.discovery_variable or ''}",
+        f"config: {config_fp}",
+        "previous_actions: " + json.dumps([_as_plain(a) for a in state.previous_actions or []], sort_keys=True, default=str),
+        "previous_summary: " + json.dumps(state.previous_engineer_summary, sort_keys=True, default=str),
+    ]
+    for source in sorted(state.rag_context):
+        parts.append(f"### {source}\n{state.rag_context[source]}")
+    return "\n".join(parts)
+
+
+class ResultCache:
+    """
+    In-memory cache of agent results keyed by exact input.
+    
+    Values are deep-copied on insert and lookup, so callers may mutate a
+    returned result without affecting later hits.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of entries kept (oldest evicted first)
+        """
+        self.max_entries = max_entries
+        self._exact: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def exact_key(text: str, namespace: str) -> str:
+        """SHA-256 key over the namespace (e.g. model/version) and canonical text."""
+        return hashlib.sha256(f"{namespace}\n{text}".encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the value stored under a key, if any."""
+        with self._lock:
+            value = self._exact.get(key)
+        return None if value is None else copy.deepcopy(value)
+    
+    def put(self, key: str, value: Any) -> None:
+        """Store a copy of a value under a key."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._exact[key] = value
+            if len(self._exact) > self.max_entries:
+                self._exact.pop(next(iter(self._exact)))
+
+
+# Shared across workflow instances (a new workflow is created per rehosting iteration)
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Get or create the shared result cache instance."""
+    global _default_cache
+    
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
@@ -7,35 +7,65 @@ Output: Updated Penguin configuration file
 """
 
 import configparser
+import logging
+import subprocess
 import sys
+import traceback
 from pathlib import Path
-from typing import Optional, Dict, Any
+from collections import deque
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Deque
 
 # Ensure parent directory is in path for imports
 if str(Path(__file__).parent.parent) not in sys.path:
     sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from rehosting.graph import create_rehosting_workflow
+from rehosting.graph import create_rehosting_workflow, WorkflowConfig
+from rehosting.graph.async_writer import AsyncActionWriter
 from src.penguin import PenguinClient
-from src.settings import is_verbose, verbose_print
+from src.settings import configure_logger, is_verbose
 
 
-def _initialize_penguin(config: configparser.ConfigParser, firmware_path: str) -> tuple[PenguinClient, Optional[Path], Dict[str, Any]]:
-    """Initialize Penguin and create project."""
+logger = logging.getLogger(__name__)
+
+
+# Engineer tools whose execution puts the workflow into discovery mode
+DISCOVERY_TRIGGER_TOOLS = frozenset({"add_environment_variable_placeholder"})
+
+# Config sections and keys that must be present before the workflow starts
+_REQUIRED_CONFIG = (
+    ('Penguin', ('image', 'iteration_timeout', 'output_dir', 'max_iter')),
+    ('Ollama', ('model',)),
+)
+
+# How much previous work is echoed into the next iteration's context
+RECENT_ACTIONS = 5
+RECENT_SUMMARIES = 3
+
+
+def _initialize_penguin(config: configparser.ConfigParser, firmware_path: str) -> tuple[PenguinClient, Optional[Path], Optional[subprocess.CompletedProcess]]:
+    """
+    Initialize Penguin and create project.
+    
+    Returns:
+        Tuple of (client, project path or None on failure, init result or
+        None if init raised). The init result carries returncode and
+        _merged_output and is used directly as context.
+    """
     print("🐧 Penguin init...")
     penguin_client = PenguinClient(config)
     
     try:
         init_result, project_path = penguin_client.init(firmware_path)
         if init_result.returncode != 0 or not project_path:
-            return penguin_client, None, {"returncode": init_result.returncode, "output": getattr(init_result, '_merged_output', '')}
+            return penguin_client, None, init_result
         
         print(f"  ✓ Project initialized at: {project_path}")
-        return penguin_client, project_path, {"returncode": 0, "output": getattr(init_result, '_merged_output', '')}
+        return penguin_client, project_path, init_result
             
     except Exception as e:
         print(f"  ❌ Penguin init failed: {e}")
-        return penguin_client, None, {"error": str(e)}
+        return penguin_client, None, None
 
 
 def _run_penguin_iteration(penguin_client: PenguinClient, project_path: Path, iteration: int) -> Dict[str, Any]:
@@ -57,63 +87,136 @@ def _run_penguin_iteration(penguin_client: PenguinClient, project_path: Path, it
     return combined_results
 
 
-def _build_multi_agent_context(
-    penguin_client,
-    combined_results,
+def _strip_ansi(text: str) -> str:
+    """
+    Remove ANSI escape sequences from terminal output in a single pass.
+    
+    Plain runs between escapes are located with str.find() and copied as
+    slices; only the escapes themselves are walked character by character.
+    Handles CSI (ESC [ params final), OSC (ESC ] ... BEL or ESC \\) and
+    two-character escapes (ESC + one byte).
+    
+    Args:
+        text: Raw terminal output
+        
+    Returns:
+        Text with escape sequences removed
+    """
+    if not text:
+        return text
+    start = text.find("\x1b")
+    if start < 0:
+        return text
+    
+    parts = []
+    pos = 0
+    n = len(text)
+    while start >= 0:
+        parts.append(text[pos:start])
+        i = start + 1
+        if i >= n:
+            pos = n
+            break
+        kind = text[i]
+        i += 1
+        if kind == "[":
+            # CSI: parameter/intermediate bytes (0x20-0x3F), then one final byte (0x40-0x7E)
+            while i < n and " " <= text[i] <= "?":
+                i += 1
+            if i < n and "@" <= text[i] <= "~":
+                i += 1
+        elif kind == "]":
+            # OSC: terminated by BEL or ST (ESC \\); unterminated runs to the end
+            bel = text.find("\x07", i)
+            st = text.find("\x1b\\", i)
+            if bel >= 0 and (st < 0 or bel < st):
+                i = bel + 1
+            elif st >= 0:
+                i = st + 2
+            else:
+                i = n
+        pos = i
+        start = text.find("\x1b", pos)
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def _build_static_context(
     init_result,
     firmware_path: str,
-    project_path: str,
+    project_path: str
+) -> dict[str, str]:
+    """
+    Build the part of the multi-agent context that is fixed for the whole run.
+    
+    Firmware/project paths and the Penguin init output never change after
+    init, so they are formatted (and ANSI-stripped) once before the loop
+    rather than on every iteration.
+    
+    Args:
+        init_result: Result object from Penguin init
+        firmware_path: Path to firmware binary
+        project_path: Path to Penguin project directory
+        
+    Returns:
+        Dictionary with keys:
+        - "metadata": Firmware and project paths
+        - "penguin_init": Init output
+    """
+    init_output = _strip_ansi(getattr(init_result, '_merged_output', ''))
+    
+    return {
+        "metadata": f"Firmware: {firmware_path}\nProject: {project_path}",
+        "penguin_init": f"Exit code: {init_result.returncode}\n\nOutput:\n{init_output}",
+    }
+
+
+def _format_summary_line(index: int, summary: Any) -> str:
+    """Format one previous engineer summary for the previous-iterations context."""
+    if isinstance(summary, dict):
+        return f"  {index}. {summary.get('status', 'unknown')} - {summary.get('message', 'no message')}"
+    return f"  {index}. {summary}"
+
+
+def _build_iteration_context(
+    penguin_client,
+    combined_results,
     iteration: int,
-    accumulated_actions: list,
-    accumulated_engineer_summaries: list
+    recent_actions: Deque[Any],
+    recent_summaries: Deque[Any],
+    total_actions: int,
+    total_summaries: int
 ) -> dict[str, str]:
     """
-    Build context for multi-agent workflow as a dictionary with source keys.
+    Build the per-iteration part of the multi-agent context.
     
-    This function extracts Penguin results as a dict and adds metadata,
-    init/run outputs, and previous iteration context. The dict structure
-    allows efficient filtering by the Planner (e.g., in discovery mode,
-    only env_cmp.txt and console.log are needed).
+    This function extracts Penguin results as a dict and adds the run
+    output and previous iteration context. Merged with the static context
+    from _build_static_context(), the dict structure allows efficient
+    filtering by the Planner (e.g., in discovery mode, only env_cmp.txt
+    and console.log are needed).
     
     Args:
         penguin_client: PenguinClient instance
         combined_results: Combined dict from client.run() containing both
                          run output and parsed results
-        init_result: Result object from Penguin init
-        firmware_path: Path to firmware binary
-        project_path: Path to Penguin project directory
         iteration: Current iteration number (0-indexed)
-        accumulated_actions: List of all previous actions
-        accumulated_engineer_summaries: List of all previous engineer summaries
+        recent_actions: Last RECENT_ACTIONS actions from previous iterations
+        recent_summaries: Last RECENT_SUMMARIES engineer summaries
+        total_actions: Number of actions across all previous iterations
+        total_summaries: Number of engineer summaries across all previous iterations
         
     Returns:
         Dictionary with keys as source names (e.g., "console.log", "env_cmp.txt")
         and values as the content strings. Special keys:
-        - "metadata": Firmware and project paths
-        - "penguin_init": Init output
         - "penguin_run": Run output
         - "penguin_results": Summary with stats and errors
         - "previous_iterations": Summary of previous work (if iteration > 0)
     """
-    import re
-    
-    def clean_output(output: str) -> str:
-        """Remove ANSI escape codes from terminal output."""
-        if not output:
-            return output
-        ansi_escape = re.compile(r'\x1b\[[0-9;]*m')
-        return ansi_escape.sub('', output)
-    
-    # Clean init output
-    init_output = clean_output(getattr(init_result, '_merged_output', ''))
-    
     # Run output is already cleaned in client.run()
     run_output = combined_results.get('output', '')
     
-    # Start with metadata and init/run outputs
     context_dict = {
-        "metadata": f"Firmware: {firmware_path}\nProject: {project_path}",
-        "penguin_init": f"Exit code: {init_result.returncode}\n\nOutput:\n{init_output}",
         "penguin_run": f"Exit code: {combined_results['returncode']}\n\nOutput:\n{run_output}",
     }
     
@@ -125,25 +228,20 @@ def _build_multi_agent_context(
     
     # Add accumulated context for iterations > 0
     if iteration > 0:
-        previous_context_parts = []
-        previous_context_parts.append(f"## Previous Iteration Context (Iteration {iteration}):")
-        previous_context_parts.append(f"Total previous actions: {len(accumulated_actions)}")
-        previous_context_parts.append(f"Total previous engineer summaries: {len(accumulated_engineer_summaries)}")
-        
-        if accumulated_actions:
-            previous_context_parts.append("\nPrevious Actions Summary:")
-            for j, action in enumerate(accumulated_actions[-5:], 1):
-                previous_context_parts.append(f"  {j}. {action.tool} - {action.status} - {action.summary}")
-        
-        if accumulated_engineer_summaries:
-            previous_context_parts.append("\nPrevious Engineer Summaries:")
-            for j, summary in enumerate(accumulated_engineer_summaries[-3:], 1):
-                if isinstance(summary, dict):
-                    previous_context_parts.append(f"  {j}. {summary.get('status', 'unknown')} - {summary.get('message', 'no message')}")
-                else:
-                    previous_context_parts.append(f"  {j}. {summary}")
-        
-        context_dict["previous_iterations"] = "\n".join(previous_context_parts)
+        recent_action_lines = "\n".join(
+            f"  {j}. {action.tool} - {action.status} - {action.summary}"
+            for j, action in enumerate(recent_actions, 1)
+        )
+        recent_summary_lines = "\n".join(
+            _format_summary_line(j, summary) for j, summary in enumerate(recent_summaries, 1)
+        )
+        context_dict["previous_iterations"] = (
+            f"## Previous Iteration Context (Iteration {iteration}):\n"
+            f"Total previous actions: {total_actions}\n"
+            f"Total previous engineer summaries: {total_summaries}"
+            + (f"\n\nPrevious Actions Summary:\n{recent_action_lines}" if recent_action_lines else "")
+            + (f"\n\nPrevious Engineer Summaries:\n{recent_summary_lines}" if recent_summary_lines else "")
+        )
     
     return context_dict
 
@@ -174,76 +272,78 @@ def _check_discovery_mode_transitions(
         - If exiting: (False, None)
         - If unchanged: (current_mode, current_variable)
     """
-    was_in_discovery_mode = discovery_mode
-    
     # Check if exiting discovery mode
-    if was_in_discovery_mode and final_state.get("discovery_mode") == False:
-        print(f"\n✅ EXITING DISCOVERY MODE for variable: {discovery_variable}")
-        print(f"   Discovery process completed")
-        return False, None
+    if discovery_mode:
+        if final_state.get("discovery_mode") == False:
+            print(f"\n✅ EXITING DISCOVERY MODE for variable: {discovery_variable}")
+            print(f"   Discovery process completed")
+            return False, None
+        return discovery_mode, discovery_variable
     
     # Check if entering discovery mode (only if not already in it)
-    if not was_in_discovery_mode:
-        if is_verbose():
-            print(f"\n[DEBUG] Checking {len(actions)} actions for add_environment_variable_placeholder")
+    logger.debug("Checking %d actions for %s", len(actions), ", ".join(sorted(DISCOVERY_TRIGGER_TOOLS)))
+    
+    for action in actions:
+        logger.debug("Action tool: %s, input: %s", action.tool, action.input)
         
-        for action in actions:
-            if is_verbose():
-                print(f"[DEBUG] Action tool: {action.tool}, input: {action.input}")
-            
-            if action.tool == "add_environment_variable_placeholder":
-                var_name = action.input.get("name", "unknown") if isinstance(action.input, dict) else "unknown"
-                print(f"\n🔍 ENTERING DISCOVERY MODE for variable: {var_name}")
-                print(f"   Next iteration will focus on discovering value for this variable")
-                return True, var_name
+        if action.tool in DISCOVERY_TRIGGER_TOOLS:
+            var_name = action.input.get("name", "unknown") if isinstance(action.input, dict) else "unknown"
+            print(f"\n🔍 ENTERING DISCOVERY MODE for variable: {var_name}")
+            print(f"   Next iteration will focus on discovering value for this variable")
+            return True, var_name
     
     return discovery_mode, discovery_variable
 
 
-def _print_iteration_summary(config_plan: Any, actions: list, accumulated_actions: list):
-    """Print summary for a single iteration."""
-    print(f"  ✓ Multi-agent workflow completed")
-    print(f"    Plan ID: {config_plan.id}")
-    print(f"    Objectives: {len(config_plan.objectives)}")
-    print(f"    Options executed: {len(config_plan.options)}")
-    print(f"    Actions completed: {len(actions)}")
-    print(f"    Total accumulated actions: {len(accumulated_actions)}")
+def _print_iteration_summary(config_plan: Any, actions: list, total_actions: int):
+    """Print summary for a single iteration (as one write)."""
+    print(
+        f"  ✓ Multi-agent workflow completed\n"
+        f"    Plan ID: {config_plan.id}\n"
+        f"    Objectives: {len(config_plan.objectives)}\n"
+        f"    Options executed: {len(config_plan.options)}\n"
+        f"    Actions completed: {len(actions)}\n"
+        f"    Total accumulated actions: {total_actions}",
+        flush=True
+    )
 
 
-def _print_final_summary(config: configparser.ConfigParser, workflow_state: Dict[str, Any], accumulated_actions: list):
-    """Print final workflow summary."""
-    print("=" * 70)
-    print("✨ Multi-Agent Workflow Complete")
-    print("=" * 70)
-    print(f"Total iterations completed: {int(config['Penguin']['max_iter'])}")
-    print(f"Total accumulated actions: {len(accumulated_actions)}")
-    print()
+def _print_final_summary(max_iter: int, workflow_state: Dict[str, Any], total_actions: int):
+    """Print final workflow summary (collected and written in one call)."""
+    lines = [
+        "=" * 70,
+        "✨ Multi-Agent Workflow Complete",
+        "=" * 70,
+        f"Total iterations completed: {max_iter}",
+        f"Total accumulated actions: {total_actions}",
+        "",
+    ]
     
     # Show final plan summary
     final_plan = workflow_state.get("config_update_plan")
     if final_plan:
-        print("Final Plan Summary:")
-        print(f"  ID: {final_plan.id}")
-        print(f"  Objectives:")
-        for i, obj in enumerate(final_plan.objectives, 1):
-            print(f"    {i}. {obj}")
-        print()
+        lines.append("Final Plan Summary:")
+        lines.append(f"  ID: {final_plan.id}")
+        lines.append("  Objectives:")
+        lines.extend(f"    {i}. {obj}" for i, obj in enumerate(final_plan.objectives, 1))
+        lines.append("")
     
     # Show final execution summary
     final_summary = workflow_state.get("engineer_summary", [])
     if final_summary:
-        print("Final Execution Summary:")
+        lines.append("Final Execution Summary:")
         for summary_item in final_summary:
             status_icon = "✅" if summary_item.get("status") == "success" else "❌"
-            print(f"  {status_icon} {summary_item.get('description', 'N/A')}")
-        print()
+            lines.append(f"  {status_icon} {summary_item.get('description', 'N/A')}")
+        lines.append("")
     
     # Show errors
     if workflow_state["errors"]:
-        print("Errors encountered:")
-        for error in workflow_state["errors"]:
-            print(f"  ❌ {error}")
-        print()
+        lines.append("Errors encountered:")
+        lines.extend(f"  ❌ {error}" for error in workflow_state["errors"])
+        lines.append("")
+    
+    print("\n".join(lines), flush=True)
 
 
 def rehost_firmware(
@@ -264,6 +364,9 @@ def rehost_firmware(
     Returns:
         Dictionary with workflow results including updated config
     """
+    # Orchestrator debug messages use the same format as verbose_print
+    configure_logger(logger, "[VERBOSE] [WORKFLOW]", verbose or is_verbose())
+    
     workflow_state = {
         "firmware_path": firmware_path,
         "success": False,
@@ -271,6 +374,7 @@ def rehost_firmware(
         "initial_results": None,
         "config_update_plan": None,
         "updated_config_path": None,
+        "action_log_path": None,
         "errors": []
     }
     
@@ -288,113 +392,143 @@ def rehost_firmware(
     print()
     
     # Initialize Penguin
-    penguin_client, project_path, init_info = _initialize_penguin(config, firmware_path)
+    penguin_client, project_path, init_result = _initialize_penguin(config, firmware_path)
     if not project_path:
         workflow_state["errors"].append("Penguin init failed")
         return workflow_state
     
     workflow_state["penguin_project"] = str(project_path)
-    init_result_for_context = type('obj', (object,), {
-        'returncode': init_info.get('returncode', 1),
-        '_merged_output': init_info.get('output', '')
-    })()
     print()
 
-    # Initialize iteration state
-    accumulated_actions = []
-    accumulated_engineer_summaries = []
+    # Initialize iteration state. Only the tail of previous work is fed back
+    # to the agents, so keep bounded windows plus running totals.
+    recent_actions = deque(maxlen=RECENT_ACTIONS)
+    recent_summaries = deque(maxlen=RECENT_SUMMARIES)
+    total_actions = 0
+    total_summaries = 0
     discovery_mode = False
     discovery_variable = None
     
-    # Main rehosting loop
-    for i in range(int(config["Penguin"]["max_iter"])):
-        print(f"Max Iterations: {config['Penguin']['max_iter']}, Current Iteration: {i+1}")
-
-        # Run Penguin iteration
-        combined_results = _run_penguin_iteration(penguin_client, project_path, i)
-        workflow_state["initial_results"] = combined_results
-    
-        # Run multi-agent workflow (Planner + Engineer)
-        print("🤖 Running multi-agent workflow (Planner → Engineer)...")
-        try:
-            # Build context for LLM (now returns dict with source keys)
-            context_dict = _build_multi_agent_context(
-                penguin_client, combined_results, init_result_for_context,
-                firmware_path, project_path,
-                i, accumulated_actions, accumulated_engineer_summaries
-            )
-
-            if is_verbose():
-                verbose_print("=" * 70)
-                verbose_print("WORKFLOW: BUILDING CONTEXT FOR MULTI-AGENT SYSTEM", prefix="[WORKFLOW]")
-                verbose_print("=" * 70)
-                verbose_print(f"Firmware: {firmware_path}", prefix="[WORKFLOW]")
-                verbose_print(f"Project: {project_path}", prefix="[WORKFLOW]")
-                verbose_print("=" * 70)
-
-            # Create and run the multi-agent workflow
-            workflow = create_rehosting_workflow(
-                config=config,
-                project_path=project_path,
-                verbose=verbose
-            )
-            
-            # Check if we're in discovery mode
-            if discovery_mode:
-                print(f"🔍 DISCOVERY MODE active for variable: {discovery_variable}")
-            
-            final_state = workflow.run(
-                firmware_path=firmware_path,
-                rag_context=context_dict,
-                goal="Analyze Penguin rehosting results and generate configuration update plan that improves firmware execution",
-                discovery_mode=discovery_mode,
-                discovery_variable=discovery_variable
-            )
-            
-            # Extract and store results
-            config_plan = final_state.get("plan")
-            actions = final_state.get("actions", [])
-            engineer_summary = final_state.get("engineer_summary", [])
-
-            if config_plan:
-                workflow_state["config_update_plan"] = config_plan
-                workflow_state["actions"] = actions
-                workflow_state["engineer_summary"] = engineer_summary
-                
-                # Accumulate results
-                accumulated_actions.extend(actions)
-                accumulated_engineer_summaries.extend(engineer_summary)
-                
-                # Check for discovery mode transitions
-                discovery_mode, discovery_variable = _check_discovery_mode_transitions(
-                    actions, discovery_mode, discovery_variable, final_state
+    # Init output and paths are fixed for the run; build that context once
+    static_context = _build_static_context(init_result, firmware_path, project_path)
+    
+    # Parse workflow settings once; a new workflow is created every iteration
+    workflow_config = WorkflowConfig.from_configparser(config)
+    
+    max_iter = int(config["Penguin"]["max_iter"])
+    
+    # One action log writer for the whole run, shared by every iteration's workflow
+    action_writer = AsyncActionWriter(project_path / "actions.jsonl")
+    try:
+        # Main rehosting loop
+        for i in range(max_iter):
+            print(f"Max Iterations: {max_iter}, Current Iteration: {i+1}")
+
+            # Create the multi-agent workflow before running Penguin. It only
+            # depends on the project (config.yaml edits from the previous
+            # iteration are already on disk), and its constructor starts the
+            # model/KB warmup thread, which then overlaps with the Penguin run
+            # instead of delaying the first planner call. Errors are re-raised
+            # below so they are reported like any other workflow failure.
+            workflow, workflow_error = None, None
+            try:
+                workflow = create_rehosting_workflow(
+                    config=workflow_config,
+                    project_path=project_path,
+                    verbose=verbose,
+                    action_writer=action_writer
+                )
+            except Exception as e:
+                workflow_error = e
+
+            # Run Penguin iteration
+            combined_results = _run_penguin_iteration(penguin_client, project_path, i)
+            workflow_state["initial_results"] = combined_results
+        
+            # Run multi-agent workflow (Planner + Engineer)
+            print("🤖 Running multi-agent workflow (Planner → Engineer)...")
+            try:
+                # Build context for LLM (dict with source keys)
+                iteration_context = _build_iteration_context(
+                    penguin_client, combined_results,
+                    i, recent_actions, recent_summaries,
+                    total_actions, total_summaries
                 )
+                # Read-only view: agents only look sources up, so nothing downstream needs a copy
+                context_dict = MappingProxyType({**static_context, **iteration_context})
+
+                logger.debug("=" * 70)
+                logger.debug("WORKFLOW: BUILDING CONTEXT FOR MULTI-AGENT SYSTEM")
+                logger.debug("=" * 70)
+                logger.debug("Firmware: %s", firmware_path)
+                logger.debug("Project: %s", project_path)
+                logger.debug("=" * 70)
+
+                if workflow_error is not None:
+                    raise workflow_error
                 
-                # Print iteration summary
-                _print_iteration_summary(config_plan, actions, accumulated_actions)
+                # Check if we're in discovery mode
+                if discovery_mode:
+                    print(f"🔍 DISCOVERY MODE active for variable: {discovery_variable}")
                 
-                if is_verbose():
-                    verbose_print("=" * 70)
-                    verbose_print("WORKFLOW: MULTI-AGENT EXECUTION COMPLETE", prefix="[WORKFLOW]")
-                    verbose_print("=" * 70)
-                    verbose_print(f"Plan ID: {config_plan.id}", prefix="[WORKFLOW]")
-                    verbose_print(f"Total actions: {len(actions)}", prefix="[WORKFLOW]")
-                    verbose_print(f"Accumulated actions: {len(accumulated_actions)}", prefix="[WORKFLOW]")
-                    verbose_print(f"Execution done: {final_state.get('done', False)}", prefix="[WORKFLOW]")
-                    verbose_print("=" * 70)
-            else:
-                workflow_state["errors"].append("Multi-agent workflow failed to generate plan")
-                print(f"  ❌ Multi-agent workflow failed to generate plan (iteration {i+1})")
+                final_state = workflow.run(
+                    firmware_path=firmware_path,
+                    rag_context=context_dict,
+                    goal="Analyze Penguin rehosting results and generate configuration update plan that improves firmware execution",
+                    discovery_mode=discovery_mode,
+                    discovery_variable=discovery_variable
+                )
                 
-        except Exception as e:
-            workflow_state["errors"].append(f"Multi-agent workflow failed: {e}")
-            print(f"  ❌ Multi-agent workflow exception (iteration {i+1}): {e}")
-            import traceback
-            traceback.print_exc()
-        print()
+                # Extract and store results
+                config_plan = final_state.get("plan")
+                actions = final_state.get("actions", [])
+                engineer_summary = final_state.get("engineer_summary", [])
+
+                if config_plan:
+                    workflow_state["config_update_plan"] = config_plan
+                    workflow_state["actions"] = actions
+                    workflow_state["engineer_summary"] = engineer_summary
+                    
+                    # Accumulate results. Every action is already appended to the
+                    # workflow's JSONL action log as it completes, so only the
+                    # recent window and totals are kept in memory here.
+                    workflow_state["action_log_path"] = str(workflow.action_log_path)
+                    recent_actions.extend(actions)
+                    recent_summaries.extend(engineer_summary)
+                    total_actions += len(actions)
+                    total_summaries += len(engineer_summary)
+                    
+                    # Check for discovery mode transitions
+                    discovery_mode, discovery_variable = _check_discovery_mode_transitions(
+                        actions, discovery_mode, discovery_variable, final_state
+                    )
+                    
+                    # Print iteration summary
+                    _print_iteration_summary(config_plan, actions, total_actions)
+                    
+                    logger.debug("=" * 70)
+                    logger.debug("WORKFLOW: MULTI-AGENT EXECUTION COMPLETE")
+                    logger.debug("=" * 70)
+                    logger.debug("Plan ID: %s", config_plan.id)
+                    logger.debug("Total actions: %d", len(actions))
+                    logger.debug("Accumulated actions: %d", total_actions)
+                    logger.debug("Execution done: %s", final_state.get("done", False))
+                    logger.debug("=" * 70)
+                else:
+                    workflow_state["errors"].append("Multi-agent workflow failed to generate plan")
+                    print(f"  ❌ Multi-agent workflow failed to generate plan (iteration {i+1})")
+                    
+            except Exception as e:
+                # Any agent/LLM/tool failure only costs this iteration; keep going.
+                workflow_state["errors"].append(f"Multi-agent workflow failed: {e}")
+                print(f"  ❌ Multi-agent workflow exception (iteration {i+1}): {e}")
+                traceback.print_exc()
+            print()
+    finally:
+        action_writer.close()
     
     # Print final summary
-    _print_final_summary(config, workflow_state, accumulated_actions)
+    _print_final_summary(max_iter, workflow_state, total_actions)
     
     workflow_state["success"] = True
     return workflow_state
@@ -408,24 +542,16 @@ def _validate_inputs(firmware_path: str, config: configparser.ConfigParser) -> b
         print(f"  ✗ Firmware file not found: {firmware_path}")
         return False
     
-    # Check required config sections
-    required_sections = ['Penguin', 'Ollama']
-    for section in required_sections:
-        if not config.has_section(section):
+    # Check required config sections and keys in one pass
+    for section, keys in _REQUIRED_CONFIG:
+        if section not in config:
             print(f"  ✗ Missing config section: {section}")
             return False
-    
-    # Check required Penguin keys
-    penguin_keys = ['image', 'iteration_timeout', 'output_dir']
-    for key in penguin_keys:
-        if not config.has_option('Penguin', key):
-            print(f"  ✗ Missing Penguin config: {key}")
-            return False
-    
-    # Check required Ollama keys
-    if not config.has_option('Ollama', 'model'):
-        print(f"  ✗ Missing Ollama model config")
-        return False
+        options = config[section]
+        for key in keys:
+            if key not in options:
+                print(f"  ✗ Missing {section} config: {key}")
+                return False
     
     return True
 
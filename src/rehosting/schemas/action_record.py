@@ -1,16 +1,40 @@
 """Action record schema for Engineer execution tracking."""
 
-from pydantic import BaseModel, Field
+import sys
+from dataclasses import asdict, dataclass
 from typing import Dict, Any
 
 
-class ActionRecord(BaseModel):
-    """Record of an executed action by the Engineer agent."""
+@dataclass(frozen=True, slots=True)
+class ActionRecord:
+    """
+    Record of an executed action by the Engineer agent.
     
-    step_id: str = Field(description="ID of the plan step being executed")
-    tool: str = Field(description="Name of the tool or function used")
-    input: Dict[str, Any] = Field(description="Input parameters provided to the tool")
-    output_uri: str = Field(description="Reference to the output (file path, ID, etc.)")
-    summary: str = Field(description="Human-readable summary of what was done")
-    status: str = Field(description="Execution status: success, partial, failed")
-
+    A plain frozen, slotted dataclass rather than a pydantic model: one is
+    created per tool execution and the fields are already typed by the Engineer.
+    
+    Attributes:
+        step_id: ID of the plan step being executed
+        tool: Name of the tool or function used
+        input: Input parameters provided to the tool
+        output_uri: Reference to the output (file path, ID, etc.)
+        summary: Human-readable summary of what was done
+        status: Execution status: success, partial, failed
+    """
+    
+    step_id: str
+    tool: str
+    input: Dict[str, Any]
+    output_uri: str
+    summary: str
+    status: str
+    
+    def __post_init__(self):
+        # Tool names and statuses come from a small fixed vocabulary and repeat
+        # across every iteration, so share one string object per value.
+        object.__setattr__(self, "tool", sys.intern(self.tool))
+        object.__setattr__(self, "status", sys.intern(self.status))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as a plain dict (for JSON serialization)."""
+        return asdict(self)
@@ -1,24 +1,29 @@
 """State schema for the rehosting workflow."""
 
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Mapping, Optional, Union
 
 
-class State(BaseModel):
-    """Shared state for rehosting agents."""
+@dataclass(slots=True)
+class State:
+    """
+    Shared state for rehosting agents.
     
-    goal: str = Field(description="The primary task or objective")
-    plan: Optional[Any] = Field(default=None, description="Current plan from the Planner")
-    rag_context: Dict[str, str] = Field(default_factory=dict, description="Context from Penguin results (key=source, value=content)")
-    budget: Dict[str, Any] = Field(default_factory=dict, description="Resource constraints")
-    done: bool = Field(default=False, description="Whether the task is complete")
+    Built once per planner call from the already-populated workflow state, so
+    it is a plain slotted dataclass rather than a validated pydantic model.
+    """
     
-    # Optional fields for previous execution context (added dynamically)
-    previous_actions: Optional[List[Any]] = Field(default=None, description="Previous execution actions")
-    previous_engineer_summary: Optional[List[Any]] = Field(default=None, description="Previous engineer summaries")
-    project_path: Optional[str] = Field(default=None, description="Path to the Penguin project")
+    goal: str  # The primary task or objective
+    plan: Optional[Any] = None  # Current plan from the Planner
+    rag_context: Mapping[str, str] = field(default_factory=dict)  # Read-only context from Penguin results (key=source, value=content)
+    budget: Dict[str, Any] = field(default_factory=dict)  # Resource constraints
+    done: bool = False  # Whether the task is complete
+    
+    # Previous execution context (empty on the first iteration)
+    previous_actions: List[Any] = field(default_factory=list)  # Previous execution actions
+    previous_engineer_summary: Union[List[Any], str, None] = None  # Previous engineer summaries
+    project_path: Optional[str] = None  # Path to the Penguin project
     
     # Discovery mode tracking
-    discovery_mode: bool = Field(default=False, description="Whether in discovery mode for environment variable")
-    discovery_variable: Optional[str] = Field(default=None, description="Name of variable being discovered")
-
+    discovery_mode: bool = False  # Whether in discovery mode for environment variable
+    discovery_variable: Optional[str] = None  # Name of variable being discovered
@@ -7,18 +7,63 @@ following the JSON tool format for better parameter handling.
 
 try:
     import yaml
+    # Prefer the libyaml-backed C implementations when PyYAML was built with them
+    try:
+        from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
 except ImportError:
     from ruamel import yaml
+    _YamlLoader, _YamlDumper = yaml.SafeLoader, yaml.SafeDumper
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache, wraps
+import os
+import shlex
 import subprocess
 import tempfile
 import shutil
 import difflib
+import copy
 import json
 
 
+# Replacement body for scripts that should just report success
+_EXIT0_SCRIPT = b"#!/bin/sh\nexit 0\n"
+
+# Directories a pseudofile may model a device in
+_PSEUDOFILE_PREFIXES = ("/sys/", "/dev/", "/proc/")
+
+
+@lru_cache(maxsize=512)
+def _split_path(path: str) -> tuple:
+    """Split a dotted config path into its keys (memoized; tools reuse a few paths)."""
+    return tuple(path.split('.'))
+
+
+def _protect_igloo_init(action: str):
+    """
+    Decorate an env-var tool so it refuses to touch igloo_init.
+    
+    Args:
+        action: Verb used in the failure message ("modify", "remove")
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, name: str, *args, **kwargs) -> Dict[str, Any]:
+            if name == "igloo_init":
+                return {
+                    "status": "failed",
+                    "message": f"Cannot {action} igloo_init environment variable",
+                    "changes": {}
+                }
+            return func(self, name, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 @dataclass
 class ToolDefinition:
     """Definition of a tool following the JSON format."""
@@ -32,124 +77,221 @@ class ToolDefinition:
 class ConfigToolRegistry:
     """Registry of configuration tools for Penguin rehosting."""
     
+    # Names of the tool methods exposed to the Engineer
+    TOOL_NAMES = (
+        "change_init_program",
+        "add_environment_variable_placeholder",
+        "set_environment_variable_value",
+        "remove_environment_variable",
+        "add_pseudofile",
+        "remove_pseudofile",
+        "set_file_read_behavior",
+        "grep_strace_output",
+        "replace_script_exit0",
+    )
+    
+    # Common init programs to try, in order of preference
+    INIT_PROGRAMS = ("/sbin/init", "/bin/init", "/usr/sbin/init", "/usr/bin/init")
+    
     def __init__(self, project_path: Path):
         self.project_path = project_path
         self.config_file = project_path / "config.yaml"
         
         # Store original config for diff purposes
         self.original_config = None
-        self.config = self._load_config()
+        loaded = self._load_config()
+        self.config = loaded if loaded is not None else {}
         
         # Store original config if it exists
         if self.config:
             self.original_config = self._deep_copy_config(self.config)
+        
+        # Snapshot of what is on disk, so no-op tool calls skip the rewrite
+        self._saved_config = self._deep_copy_config(self.config) if loaded is not None else None
+        
+        # Set once a tool has written a change; avoids a full dict compare for summaries
+        self._dirty = False
+        
+        # Serialized YAML lines for get_config_diff (original never changes;
+        # current is invalidated whenever a change is saved)
+        self._original_yaml_lines = None
+        self._current_yaml_lines = None
+        
+        # Fingerprint of original_config, computed on first change check
+        self._original_fp = None
+        
+        # While a batch() is open, tool saves are deferred to its end
+        self._in_batch = False
+        
+        # Init program that change_init_program last found, checked first next time
+        self._init_program = None
+        
+        # Script directories replace_script_exit0 already created
+        self._created_dirs = set()
+        
+        # Bound tool methods, built once per registry
+        self._tools = {name: getattr(self, name) for name in self.TOOL_NAMES}
     
-    def _load_config(self) -> Dict[str, Any]:
-        """Load existing config.yaml or return empty dict."""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    return yaml.safe_load(f) or {}
-            except Exception as e:
-                print(f"Warning: Could not load config.yaml: {e}")
-                return {}
-        return {}
+    def _load_config(self) -> Optional[Dict[str, Any]]:
+        """
+        Load existing config.yaml.
+        
+        The file is read as bytes in one call and handed to the loader, which
+        decodes UTF-8 itself; a missing file is detected from the open.
+        
+        Returns:
+            Parsed config (empty dict if it can't be parsed), or None if the
+            file does not exist
+        """
+        try:
+            data = self.config_file.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Warning: Could not load config.yaml: {e}")
+            return {}
+        try:
+            return yaml.load(data, Loader=_YamlLoader) or {}
+        except Exception as e:
+            print(f"Warning: Could not load config.yaml: {e}")
+            return {}
     
     def _save_config(self) -> bool:
-        """Save config to file."""
+        """Save config to file (skipped if it matches what was last written, or deferred inside batch())."""
+        if self._in_batch or self.config == self._saved_config:
+            return True
+        tmp_path = None
         try:
-            with open(self.config_file, 'w') as f:
-                yaml.dump(self.config, f, default_flow_style=False, sort_keys=False)
+            # Emit into a 64 KiB buffered binary temp file next to config.yaml,
+            # then atomically swap it in so Penguin never sees a partial file
+            fd, tmp_path = tempfile.mkstemp(prefix=".config.yaml.", dir=self.config_file.parent)
+            with open(fd, 'wb', buffering=1 << 16) as f:
+                yaml.dump(self.config, f, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False, encoding='utf-8')
+            if self.config_file.exists():
+                shutil.copymode(self.config_file, tmp_path)
+            else:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.config_file)
+            self._saved_config = self._deep_copy_config(self.config)
+            # Only a change that reached disk invalidates the diff
+            self._dirty = True
+            self._current_yaml_lines = None
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
             return False
     
-    def _ensure_section(self, path: str) -> None:
-        """Ensure a nested section exists in config."""
-        parts = path.split('.')
-        current = self.config
+    @contextmanager
+    def batch(self):
+        """
+        Apply several tool calls with a single config.yaml write.
+        
+        Tool methods still mutate the in-memory config immediately; the save
+        each of them performs is deferred until the outermost batch exits.
+        The config is written even if the block raises.
+        
+        Raises:
+            OSError: If the deferred save fails (and the block did not raise)
+        """
+        outer = not self._in_batch
+        self._in_batch = True
+        try:
+            yield self
+        finally:
+            if outer:
+                self._in_batch = False
+                saved = self._save_config()
+        if outer and not saved:
+            raise OSError(f"Failed to save {self.config_file}")
+    
+    def _walk(self, parts: tuple, create: bool = False) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Walk to the dict that holds the last key of a split config path.
         
+        Args:
+            parts: Path keys as returned by _split_path()
+            create: Create missing (or empty) intermediate sections
+            
+        Returns:
+            Tuple of (parent dict, last key), or (None, None) if the parent
+            does not exist and create is False
+        """
+        current = self.config
         for part in parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            current = current[part]
+            nxt = current.get(part) if isinstance(current, dict) else None
+            if nxt is None:
+                if not create:
+                    return None, None
+                nxt = current[part] = {}
+            current = nxt
+        if not isinstance(current, dict):
+            return None, None
+        return current, parts[-1]
+    
+    def _ensure_section(self, path: str) -> None:
+        """Ensure a nested section exists in config."""
+        self._walk(_split_path(path), create=True)
     
     def _get_nested_value(self, path: str) -> Any:
         """Get value from nested path."""
-        parts = path.split('.')
-        current = self.config
-        
-        for part in parts:
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return None
-        return current
+        parent, key = self._walk(_split_path(path))
+        if parent is None:
+            return None
+        return parent.get(key)
     
     def _set_nested_value(self, path: str, value: Any) -> None:
         """Set value at nested path."""
-        parts = path.split('.')
-        current = self.config
-        
-        for part in parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            current = current[part]
-        
-        current[parts[-1]] = value
+        parent, key = self._walk(_split_path(path), create=True)
+        parent[key] = value
     
     def _add_to_list(self, path: str, value: Any) -> None:
         """Add value to list at path."""
-        parts = path.split('.')
-        current = self.config
-        
-        for part in parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            current = current[part]
-        
-        if parts[-1] not in current:
-            current[parts[-1]] = []
-        
-        if not isinstance(current[parts[-1]], list):
-            current[parts[-1]] = []
-        
-        current[parts[-1]].append(value)
+        parent, key = self._walk(_split_path(path), create=True)
+        items = parent.get(key)
+        if not isinstance(items, list):
+            items = parent[key] = []
+        items.append(value)
     
     def _remove_from_list(self, path: str, value: Any) -> bool:
         """Remove value from list at path."""
-        parts = path.split('.')
-        current = self.config
-        
-        for part in parts[:-1]:
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
+        parent, key = self._walk(_split_path(path))
+        items = parent.get(key) if parent is not None else None
+        if isinstance(items, list):
+            try:
+                items.remove(value)
+                return True
+            except ValueError:
                 return False
-        
-        if isinstance(current, dict) and parts[-1] in current:
-            if isinstance(current[parts[-1]], list):
-                try:
-                    current[parts[-1]].remove(value)
-                    return True
-                except ValueError:
-                    return False
         return False
     
     def _remove_nested_value(self, path: str) -> bool:
         """Remove value at nested path."""
-        parts = path.split('.')
-        current = self.config
-        
-        for part in parts[:-1]:
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return False
-        
-        if isinstance(current, dict) and parts[-1] in current:
-            del current[parts[-1]]
+        parent, key = self._walk(_split_path(path))
+        if parent is not None and key in parent:
+            del parent[key]
+            return True
+        return False
+    
+    # The env section is the hot path for tools; these skip the generic
+    # split-and-walk and also keep names containing dots as a single key
+    
+    def _set_env(self, name: str, value: Any) -> None:
+        """Set an environment variable in the env section (created if missing)."""
+        env = self.config.get("env")
+        if env is None:
+            env = self.config["env"] = {}
+        env[name] = value
+    
+    def _del_env(self, name: str) -> bool:
+        """Remove an environment variable from the env section."""
+        env = self.config.get("env")
+        if env and name in env:
+            del env[name]
             return True
         return False
     
@@ -162,13 +304,15 @@ class ConfigToolRegistry:
         Invoke if you see something like: Kernel panic - not syncing: Attempted to kill init! exitcode=0x00000000
         """
         try:
-            # Common init programs to try
-            init_programs = ["/sbin/init", "/bin/init", "/usr/sbin/init", "/usr/bin/init"]
+            # Try to find a working init program, starting with the last one found
+            init_programs = self.INIT_PROGRAMS
+            if self._init_program is not None:
+                init_programs = (self._init_program,) + init_programs
             
-            # Try to find a working init program
             for init_prog in init_programs:
-                if Path(init_prog).exists():
-                    self._set_nested_value("env.igloo_init", init_prog)
+                if os.access(init_prog, os.F_OK):
+                    self._init_program = init_prog
+                    self._set_env("igloo_init", init_prog)
                     if self._save_config():
                         return {
                             "status": "success",
@@ -188,6 +332,7 @@ class ConfigToolRegistry:
                 "changes": {}
             }
     
+    @_protect_igloo_init("modify")
     def add_environment_variable_placeholder(self, name: str, reason: str) -> Dict[str, Any]:
         """
         Add a new environment variable with a magic placeholder value for dynamic discovery.
@@ -200,16 +345,9 @@ class ConfigToolRegistry:
         Do not make up any fake arguments.
         """
         try:
-            if name == "igloo_init":
-                return {
-                    "status": "failed",
-                    "message": "Cannot modify igloo_init environment variable",
-                    "changes": {}
-                }
-            
             # Set to a placeholder value that can be discovered dynamically
             placeholder_value = "DYNVALDYNVALDYNVAL"
-            self._set_nested_value(f"env.{name}", placeholder_value)
+            self._set_env(name, placeholder_value)
             
             if self._save_config():
                 return {
@@ -230,6 +368,7 @@ class ConfigToolRegistry:
                 "changes": {}
             }
     
+    @_protect_igloo_init("modify")
     def set_environment_variable_value(self, name: str, value: str, reason: str) -> Dict[str, Any]:
         """
         Set the actual value for an environment variable that was previously added with a placeholder.
@@ -237,15 +376,10 @@ class ConfigToolRegistry:
         Use this after dynamic discovery has found the real value.
         """
         try:
-            if name == "igloo_init":
-                return {
-                    "status": "failed",
-                    "message": "Cannot modify igloo_init environment variable",
-                    "changes": {}
-                }
-            
-            # Set the actual value
-            self._set_nested_value(f"env.{name}", value)
+            # Set the actual value (no write needed if it is already set)
+            env = self.config.get("env")
+            if not env or env.get(name) != value:
+                self._set_env(name, value)
             
             if self._save_config():
                 return {
@@ -266,6 +400,7 @@ class ConfigToolRegistry:
                 "changes": {}
             }
     
+    @_protect_igloo_init("remove")
     def remove_environment_variable(self, name: str, reason: str) -> Dict[str, Any]:
         """
         Remove an environment variable from the Penguin config.yaml.
@@ -274,14 +409,7 @@ class ConfigToolRegistry:
         Do not make up any fake arguments.
         """
         try:
-            if name == "igloo_init":
-                return {
-                    "status": "failed",
-                    "message": "Cannot remove igloo_init environment variable",
-                    "changes": {}
-                }
-            
-            if self._remove_nested_value(f"env.{name}"):
+            if self._del_env(name):
                 if self._save_config():
                     return {
                         "status": "success",
@@ -318,18 +446,18 @@ class ConfigToolRegistry:
         """
         try:
             # Validate path is in allowed directories
-            if not any(filepath.startswith(prefix) for prefix in ["/sys/", "/dev/", "/proc/"]):
+            if not filepath.startswith(_PSEUDOFILE_PREFIXES):
                 return {
                     "status": "failed",
                     "message": "Pseudofile path must be in /sys, /dev, or /proc",
                     "changes": {}
                 }
             
-            # Ensure pseudofiles section exists
-            self._ensure_section("pseudofiles")
-            
-            # Check if pseudofile already exists
-            if filepath in self.config.get("pseudofiles", {}):
+            # Ensure pseudofiles section exists and check if the pseudofile already does
+            pseudofiles = self.config.get("pseudofiles")
+            if pseudofiles is None:
+                pseudofiles = self.config["pseudofiles"] = {}
+            elif filepath in pseudofiles:
                 return {
                     "status": "failed",
                     "message": f"Pseudofile {filepath} already exists",
@@ -342,10 +470,7 @@ class ConfigToolRegistry:
                 pseudofile_entry["name"] = name
             
             # Add pseudofile entry to the dictionary structure
-            if "pseudofiles" not in self.config:
-                self.config["pseudofiles"] = {}
-            
-            self.config["pseudofiles"][filepath] = pseudofile_entry
+            pseudofiles[filepath] = pseudofile_entry
             
             if self._save_config():
                 return {
@@ -372,8 +497,8 @@ class ConfigToolRegistry:
         """
         try:
             # Check if pseudofiles section exists and contains the filepath
-            pseudofiles = self.config.get("pseudofiles", {})
-            if filepath in pseudofiles:
+            pseudofiles = self.config.get("pseudofiles")
+            if pseudofiles and filepath in pseudofiles:
                 del pseudofiles[filepath]
                 if self._save_config():
                     return {
@@ -415,8 +540,8 @@ class ConfigToolRegistry:
                 }
             
             # Find pseudofile and update its read behavior
-            pseudofiles = self.config.get("pseudofiles", {})
-            if filepath in pseudofiles:
+            pseudofiles = self.config.get("pseudofiles")
+            if pseudofiles and filepath in pseudofiles:
                 pseudofiles[filepath]["read_model"] = model
                 if model == "const_buf":
                     pseudofiles[filepath]["read_value"] = value
@@ -461,17 +586,18 @@ class ConfigToolRegistry:
                     "changes": {}
                 }
             
-            # Find the most recent results directory
-            result_dirs = [d for d in results_dir.iterdir() if d.is_dir()]
-            if not result_dirs:
+            # Find the most recent results directory (scandir entries carry the
+            # file type from readdir, so no extra stat per run directory)
+            with os.scandir(results_dir) as entries:
+                latest_result = max((e for e in entries if e.is_dir()), key=lambda e: e.name, default=None)
+            if latest_result is None:
                 return {
                     "status": "failed",
                     "message": "No result directories found",
                     "changes": {}
                 }
             
-            latest_result = max(result_dirs, key=lambda d: d.name)
-            strace_file = latest_result / "console.log"
+            strace_file = Path(latest_result.path) / "console.log"
             
             if not strace_file.exists():
                 return {
@@ -480,9 +606,20 @@ class ConfigToolRegistry:
                     "changes": {}
                 }
             
-            # Execute grep command
-            cmd = f"grep {grep_command} {strace_file}"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            # Execute grep directly (no shell): the LLM-provided options and
+            # pattern are split with shell quoting rules but never interpreted
+            # by a shell, so there is no extra fork and no command injection
+            try:
+                grep_args = shlex.split(grep_command)
+            except ValueError as e:
+                return {
+                    "status": "failed",
+                    "message": f"Invalid grep arguments: {e}",
+                    "changes": {}
+                }
+            argv = ["grep", *grep_args, str(strace_file)]
+            cmd = shlex.join(argv)
+            result = subprocess.run(argv, capture_output=True, text=True)
             
             return {
                 "status": "success",
@@ -508,17 +645,14 @@ class ConfigToolRegistry:
         For example, if something keeps trying to tell the system to turn off with shutdown script '/bin/killall', replace it with 'exit0.sh'.
         """
         try:
-            # Create exit0.sh script
-            exit0_script = "#!/bin/sh\nexit 0\n"
-            
-            # Create the replacement script
             script_file = self.project_path / script_path
-            script_file.parent.mkdir(parents=True, exist_ok=True)
+            parent = script_file.parent
+            if parent not in self._created_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                self._created_dirs.add(parent)
             
-            with open(script_file, 'w') as f:
-                f.write(exit0_script)
-            
-            # Make it executable
+            # Write the exit0.sh stub and make it executable
+            script_file.write_bytes(_EXIT0_SCRIPT)
             script_file.chmod(0o755)
             
             return {
@@ -536,36 +670,20 @@ class ConfigToolRegistry:
     # Tool registry for easy access
     def get_tool(self, tool_name: str):
         """Get tool function by name."""
-        tools = {
-            "change_init_program": self.change_init_program,
-            "add_environment_variable_placeholder": self.add_environment_variable_placeholder,
-            "set_environment_variable_value": self.set_environment_variable_value,
-            "remove_environment_variable": self.remove_environment_variable,
-            "add_pseudofile": self.add_pseudofile,
-            "remove_pseudofile": self.remove_pseudofile,
-            "set_file_read_behavior": self.set_file_read_behavior,
-            "grep_strace_output": self.grep_strace_output,
-            "replace_script_exit0": self.replace_script_exit0,
-        }
-        return tools.get(tool_name)
+        return self._tools.get(tool_name)
     
     def list_tools(self) -> List[str]:
         """List available tool names."""
-        return [
-            "change_init_program",
-            "add_environment_variable_placeholder",
-            "set_environment_variable_value",
-            "remove_environment_variable",
-            "add_pseudofile",
-            "remove_pseudofile",
-            "set_file_read_behavior",
-            "grep_strace_output",
-            "replace_script_exit0",
-        ]
+        return list(self._tools)
     
     def _deep_copy_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Create a deep copy of the config for diff purposes."""
-        return json.loads(json.dumps(config))
+        return copy.deepcopy(config)
+    
+    @staticmethod
+    def _dump_lines(config: Dict[str, Any]) -> List[str]:
+        """Serialize a config to YAML, split into lines with line endings kept."""
+        return yaml.dump(config, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False).splitlines(keepends=True)
     
     def get_config_diff(self) -> str:
         """
@@ -577,21 +695,50 @@ class ConfigToolRegistry:
         if not self.original_config:
             return "No original config to compare against"
         
-        # Convert both configs to YAML strings for diff
-        original_yaml = yaml.dump(self.original_config, default_flow_style=False, sort_keys=False)
-        current_yaml = yaml.dump(self.config, default_flow_style=False, sort_keys=False)
+        # Nothing has been written since load, so there is nothing to diff
+        if not self._dirty:
+            return ""
+        
+        # Serialize each side once; the original is fixed and the current
+        # lines (what was last written) are only rebuilt after a saved change
+        if self._original_yaml_lines is None:
+            self._original_yaml_lines = self._dump_lines(self.original_config)
+        if self._current_yaml_lines is None:
+            self._current_yaml_lines = self._dump_lines(self._saved_config)
         
         # Generate unified diff
         diff_lines = difflib.unified_diff(
-            original_yaml.splitlines(keepends=True),
-            current_yaml.splitlines(keepends=True),
+            self._original_yaml_lines,
+            self._current_yaml_lines,
             fromfile="original config.yaml",
-            tofile="current config.yaml",
-            lineterm=""
+            tofile="current config.yaml"
         )
         
         return "".join(diff_lines)
     
+    @staticmethod
+    def _fingerprint(config: Dict[str, Any]) -> Optional[int]:
+        """Cheap content fingerprint of a config (None if keys can't be ordered)."""
+        try:
+            return hash(json.dumps(config, sort_keys=True, default=str))
+        except TypeError:
+            return None
+    
+    def _has_changes(self) -> bool:
+        """
+        Whether the current config differs from the one loaded at startup.
+        
+        Nothing written means nothing changed; otherwise compare JSON
+        fingerprints (much cheaper than YAML emission), so a change that was
+        later undone is not reported.
+        """
+        if not self._dirty:
+            return False
+        if self._original_fp is None:
+            self._original_fp = self._fingerprint(self.original_config or {})
+        current_fp = self._fingerprint(self.config)
+        return current_fp is None or current_fp != self._original_fp
+    
     def get_config_summary(self) -> Dict[str, Any]:
         """
         Get a summary of the current configuration.
@@ -603,7 +750,7 @@ class ConfigToolRegistry:
             "file_path": str(self.config_file),
             "exists": self.config_file.exists(),
             "sections": list(self.config.keys()) if self.config else [],
-            "has_changes": self.original_config != self.config if self.original_config else False
+            "has_changes": self._has_changes()
         }
         
         # Count items in each section
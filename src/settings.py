@@ -5,7 +5,9 @@ This module provides a centralized place to store runtime settings
 that need to be accessed from anywhere in the project.
 """
 
-from typing import Optional
+from typing import Callable, Optional
+import logging
+import sys
 import threading
 
 
@@ -61,6 +63,36 @@ def is_verbose() -> bool:
     return _settings.verbose
 
 
+def configure_logger(logger: logging.Logger, prefix: str, verbose: Optional[bool] = None) -> logging.Logger:
+    """Route a module logger to stdout with a component prefix.
+    
+    The stdout handler is attached once; the level is refreshed on every
+    call (DEBUG in verbose mode, INFO otherwise), so it follows later
+    set_verbose() changes.
+    
+    Example:
+        configure_logger(logging.getLogger(__name__), "[KB]")
+        # log.info("Loaded") prints: [KB] Loaded
+    
+    Args:
+        logger: Logger to configure
+        prefix: Text printed before every message (e.g. "[VERBOSE] [WORKFLOW]")
+        verbose: Override for the global verbose flag
+    
+    Returns:
+        The configured logger
+    """
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter(f"{prefix} %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    if verbose is None:
+        verbose = is_verbose()
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    return logger
+
+
 def verbose_print(message: str, prefix: str = ""):
     """Print message only if verbose mode is enabled.
     
@@ -89,3 +121,15 @@ def verbose_print(message: str, prefix: str = ""):
         for line in lines:
             print(f"{full_prefix} {line}")
 
+
+
+def verbose_print_lazy(message_fn: Callable[[], str], prefix: str = ""):
+    """Like verbose_print, but only builds the message when verbose mode is enabled.
+    
+    Use for messages that are expensive to produce (e.g. large JSON dumps).
+    
+    Example:
+        verbose_print_lazy(lambda: json.dumps(plan.model_dump(), indent=2))
+    """
+    if is_verbose():
+        verbose_print(message_fn(), prefix=prefix)
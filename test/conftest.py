@@ -0,0 +1,12 @@
+"""Pytest setup: make both `src.rehosting...` and `rehosting...` imports resolve."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# Interactive Ollama chat script, not a pytest module
+collect_ignore = ["test_ollama.py"]
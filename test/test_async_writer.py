@@ -0,0 +1,34 @@
+"""Tests for the background action record writer."""
+
+import json
+
+from src.rehosting.graph.async_writer import AsyncActionWriter
+from src.rehosting.schemas import ActionRecord
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_flush_writes_queued_records_and_close_stops_thread(tmp_path):
+    path = tmp_path / "logs" / "actions.jsonl"
+    writer = AsyncActionWriter(path)
+    writer.write(ActionRecord(step_id="1", tool="set_env", input={}, output_uri="", summary="ok", status="success"))
+    writer.write({"step_id": "2"})
+    writer.flush()
+
+    assert [record["step_id"] for record in _lines(path)] == ["1", "2"]
+    assert writer._thread.is_alive()
+
+    writer.close()
+    assert not writer._thread.is_alive()
+
+
+def test_appends_to_existing_log(tmp_path):
+    path = tmp_path / "actions.jsonl"
+    path.write_text('{"step_id": "0"}\n')
+    writer = AsyncActionWriter(path)
+    writer.write({"step_id": "1"})
+    writer.close()
+
+    assert [record["step_id"] for record in _lines(path)] == ["0", "1"]
@@ -0,0 +1,107 @@
+"""Tests for ConfigToolRegistry against a temporary Penguin project."""
+
+import os
+import stat
+
+import pytest
+import yaml
+
+from src.rehosting.tools.config_tools import ConfigToolRegistry
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "config.yaml").write_text("core:\n  arch: armel\nenv:\n  igloo_init: /sbin/init\n")
+    return tmp_path
+
+
+def test_replace_script_exit0_writes_executable_stub(project):
+    registry = ConfigToolRegistry(project)
+    existing = project / "static" / "bin" / "killall"
+    existing.parent.mkdir(parents=True)
+    existing.write_text("#!/bin/sh\nreboot\n")
+
+    for script in ("static/bin/killall", "static/bin/shutdown"):
+        assert registry.replace_script_exit0(script, reason="test")["status"] == "success"
+        script_file = project / script
+        assert script_file.read_bytes() == b"#!/bin/sh\nexit 0\n"
+        assert stat.S_IMODE(script_file.stat().st_mode) == 0o755
+        assert script_file.stat().st_nlink == 1
+
+    # No helper files are left in the project
+    assert sorted(os.listdir(project)) == ["config.yaml", "static"]
+
+
+def _fail_replace(src, dst):
+    raise OSError("disk full")
+
+
+def test_failed_save_does_not_mark_config_changed(project, monkeypatch):
+    registry = ConfigToolRegistry(project)
+    before = (project / "config.yaml").read_text()
+
+    monkeypatch.setattr(os, "replace", _fail_replace)
+    assert registry.set_environment_variable_value("FOO", "1", reason="test")["status"] == "failed"
+    monkeypatch.undo()
+
+    assert (project / "config.yaml").read_text() == before
+    assert not registry._dirty
+    assert registry.get_config_diff() == ""
+    assert [name for name in os.listdir(project) if name.startswith(".config.yaml.")] == []
+
+
+def test_diff_shows_saved_config_only(project, monkeypatch):
+    registry = ConfigToolRegistry(project)
+    assert registry.set_environment_variable_value("FOO", "1", reason="test")["status"] == "success"
+
+    monkeypatch.setattr(os, "replace", _fail_replace)
+    assert registry.set_environment_variable_value("BAR", "2", reason="test")["status"] == "failed"
+    monkeypatch.undo()
+
+    diff = registry.get_config_diff()
+    assert "+  FOO: '1'" in diff
+    assert "BAR" not in diff
+
+
+def test_config_diff_headers(project):
+    registry = ConfigToolRegistry(project)
+    registry.set_environment_variable_value("FOO", "1", reason="test")
+
+    lines = registry.get_config_diff().splitlines()
+    assert lines[0] == "--- original config.yaml"
+    assert lines[1] == "+++ current config.yaml"
+    assert lines[2].startswith("@@ ")
+    assert "+  FOO: '1'" in lines
+
+
+def test_config_diff_short_circuits_without_saved_changes(project, monkeypatch):
+    (project / "config.yaml").write_text("env:\n  FOO: '1'\n")
+    registry = ConfigToolRegistry(project)
+    assert registry.get_config_diff() == ""
+
+    # A no-op tool call neither rewrites config.yaml nor serializes a diff
+    monkeypatch.setattr(os, "replace", _fail_replace)
+    monkeypatch.setattr(ConfigToolRegistry, "_dump_lines", staticmethod(lambda config: pytest.fail("diff serialized")))
+    assert registry.set_environment_variable_value("FOO", "1", reason="test")["status"] == "success"
+    assert registry.get_config_diff() == ""
+    assert not registry._has_changes()
+
+
+def test_config_diff_without_original_config(tmp_path):
+    assert ConfigToolRegistry(tmp_path).get_config_diff() == "No original config to compare against"
+
+
+@pytest.mark.parametrize("tool", ["add_environment_variable_placeholder", "set_environment_variable_value"])
+def test_dotted_env_var_name_is_a_single_key(project, tool):
+    registry = ConfigToolRegistry(project)
+    params = {"name": "net.ipv4.ip_forward", "reason": "test"}
+    if tool == "set_environment_variable_value":
+        params["value"] = "1"
+    assert registry.get_tool(tool)(**params)["status"] == "success"
+
+    env = yaml.safe_load((project / "config.yaml").read_text())["env"]
+    assert "net.ipv4.ip_forward" in env
+    assert "net" not in env
+
+    assert registry.remove_environment_variable("net.ipv4.ip_forward", reason="test")["status"] == "success"
+    assert yaml.safe_load((project / "config.yaml").read_text())["env"] == {"igloo_init": "/sbin/init"}
@@ -0,0 +1,131 @@
+"""Tests for EngineerAgent option execution against a temporary Penguin project."""
+
+import os
+import threading
+import time
+
+import pytest
+import yaml
+
+pytest.importorskip("pydantic")
+pytest.importorskip("ollama")
+
+from src.rehosting.agents.engineer import EngineerAgent
+from src.rehosting.tools import config_tools
+
+
+@pytest.fixture
+def engineer(tmp_path):
+    (tmp_path / "config.yaml").write_text("core:\n  arch: armel\nenv:\n  igloo_init: /sbin/init\n")
+    return EngineerAgent(project_path=tmp_path, kb_path=None)
+
+
+def _respond_with(engineer, monkeypatch, tool_calls_by_option):
+    """Replace the LLM with canned tool calls keyed by option description."""
+    def fake_llm(description, option_data):
+        return {"action": "execute", "tool_calls": tool_calls_by_option[description], "reasoning": ""}
+    monkeypatch.setattr(engineer, "_call_llm_for_implementation", fake_llm)
+
+
+def _set_env(name, value):
+    return {"tool": "set_environment_variable_value", "params": {"name": name, "value": value, "reason": "test"}}
+
+
+def _load(engineer):
+    return yaml.safe_load((engineer.project_path / "config.yaml").read_text())
+
+
+def test_tool_calls_of_an_option_are_written_once(engineer, monkeypatch):
+    _respond_with(engineer, monkeypatch, {"set env": [_set_env("A", "1"), _set_env("B", "2"), _set_env("C", "3")]})
+    writes = []
+    real_replace = os.replace
+    monkeypatch.setattr(config_tools.os, "replace", lambda src, dst: (writes.append(dst), real_replace(src, dst)))
+
+    outcome = engineer.execute_option({"option_id": "1", "description": "set env"}, 1, 1)
+
+    assert outcome["summary"]["status"] == "success"
+    assert len(writes) == 1
+    assert _load(engineer)["env"] == {"igloo_init": "/sbin/init", "A": "1", "B": "2", "C": "3"}
+
+
+def test_failed_config_flush_is_reported(engineer, monkeypatch):
+    _respond_with(engineer, monkeypatch, {"set env": [_set_env("A", "1")]})
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(config_tools.os, "replace", fail_replace)
+
+    outcome = engineer.execute_option({"option_id": "1", "description": "set env"}, 1, 1)
+
+    assert outcome["summary"]["status"] == "failed"
+    assert outcome["summary"]["message"].startswith("Failed to save config changes")
+    assert engineer.state.failed_options == ["1"]
+    assert "A" not in _load(engineer)["env"]
+
+
+def test_concurrent_options_apply_in_priority_order(engineer, monkeypatch):
+    _respond_with(engineer, monkeypatch, {"first": [_set_env("MODE", "first")], "second": [_set_env("MODE", "second")]})
+    slow_first = engineer._call_llm_for_implementation
+
+    def fake_llm(description, option_data):
+        if description == "first":
+            time.sleep(0.2)  # Option 1 finishes reasoning after option 2
+        return slow_first(description, option_data)
+    monkeypatch.setattr(engineer, "_call_llm_for_implementation", fake_llm)
+
+    options = [{"option_id": "1", "description": "first"}, {"option_id": "2", "description": "second"}]
+    threads = [threading.Thread(target=engineer.execute_option, args=(opt, i, 2)) for i, opt in enumerate(options, 1)]
+    for thread in reversed(threads):
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert [record.step_id for record in engineer.state.action_records] == ["1", "2"]
+    assert _load(engineer)["env"]["MODE"] == "second"
+
+
+def test_failed_placeholder_does_not_block_later_options(engineer, monkeypatch):
+    def placeholder(name):
+        return {"tool": "add_environment_variable_placeholder", "params": {"name": name, "reason": "test"}}
+    _respond_with(engineer, monkeypatch, {"bad": [placeholder("igloo_init")], "good": [placeholder("sxid")], "extra": [placeholder("other")]})
+
+    assert engineer.execute_option({"option_id": "1", "description": "bad"}, 1, 3)["summary"]["status"] == "failed"
+    assert engineer.execute_option({"option_id": "2", "description": "good"}, 2, 3)["summary"]["status"] == "success"
+    assert engineer.execute_option({"option_id": "3", "description": "extra"}, 3, 3)["summary"]["status"] == "failed"
+    assert _load(engineer)["env"]["sxid"] == "DYNVALDYNVALDYNVAL"
+    assert "other" not in _load(engineer)["env"]
+
+
+def test_option_that_raises_hands_on_its_turn(engineer, monkeypatch):
+    _respond_with(engineer, monkeypatch, {"second": [_set_env("MODE", "second")]})
+    results = {}
+
+    def run(option, index):
+        try:
+            results[index] = engineer.execute_option(option, index, 2)
+        except Exception as e:
+            results[index] = e
+
+    # Option 1 fails before reasoning (a non-string priority breaks the progress line)
+    options = [{"option_id": "1", "description": "first", "priority": 5}, {"option_id": "2", "description": "second"}]
+    threads = [threading.Thread(target=run, args=(opt, i)) for i, opt in enumerate(options, 1)]
+    for thread in reversed(threads):
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert isinstance(results[1], AttributeError)
+    assert results[2]["summary"]["status"] == "success"
+    assert _load(engineer)["env"]["MODE"] == "second"
+
+
+def test_option_fails_when_earlier_options_never_apply(engineer, monkeypatch):
+    _respond_with(engineer, monkeypatch, {"second": [_set_env("MODE", "second")]})
+    monkeypatch.setattr(engineer, "OPTION_TURN_TIMEOUT", 0.1)
+
+    outcome = engineer.execute_option({"option_id": "2", "description": "second"}, 2, 2)
+
+    assert outcome["summary"]["status"] == "failed"
+    assert "waiting for earlier options" in outcome["summary"]["message"]
+    assert engineer.state.failed_options == ["2"]
+    assert "MODE" not in _load(engineer)["env"]
@@ -0,0 +1,79 @@
+"""Tests for KnowledgeBase embedding similarity matching (with a fake Ollama embed)."""
+
+import sys
+import types
+
+import pytest
+
+from src.rehosting.knowledge_base import KnowledgeBase
+
+OBSERVED = "zzqx unmatched observation"
+TARGET_ISSUE = next(iter(KnowledgeBase.COMMON_ISSUES))
+TARGET_SYMPTOMS = set(KnowledgeBase.COMMON_ISSUES[TARGET_ISSUE]["symptoms"])
+
+
+@pytest.fixture
+def embed_calls(monkeypatch):
+    """
+    Install a fake `ollama.embed` and record the inputs it is called with.
+    
+    Symptoms of TARGET_ISSUE embed to [1, 0, 0], other symptoms to [0, 0, 1],
+    and OBSERVED to [0.8, 0.6, 0] (cosine 0.8 with the target symptoms).
+    """
+    calls = []
+
+    def embed(model, input):
+        calls.append(list(input))
+        vectors = []
+        for text in input:
+            if text == OBSERVED:
+                vectors.append([0.8, 0.6, 0.0])
+            elif text in TARGET_SYMPTOMS:
+                vectors.append([1.0, 0.0, 0.0])
+            else:
+                vectors.append([0.0, 0.0, 1.0])
+        return {"embeddings": vectors}
+
+    monkeypatch.setitem(sys.modules, "ollama", types.SimpleNamespace(embed=embed))
+    return calls
+
+
+def _kb(tmp_path, threshold=0.8):
+    kb = KnowledgeBase()
+    kb.enable_embeddings("fake-embed", threshold=threshold, cache_dir=tmp_path)
+    return kb
+
+
+def test_symptom_embeddings_are_persisted_and_reused(tmp_path, embed_calls):
+    first = _kb(tmp_path).symptom_embeddings()
+    assert len(embed_calls) == 1  # All symptoms in one batch request
+    cache_files = list(tmp_path.glob("kb_embeddings_fake-embed_*.json"))
+    assert len(cache_files) == 1
+
+    second = _kb(tmp_path).symptom_embeddings()
+    assert len(embed_calls) == 1  # Loaded from disk, no new request
+    assert second == first
+
+
+def test_unreadable_embedding_cache_is_recomputed(tmp_path, embed_calls):
+    _kb(tmp_path).symptom_embeddings()
+    cache_file = next(tmp_path.glob("kb_embeddings_*.json"))
+    cache_file.write_text("[[1.0, 0.0")
+
+    assert _kb(tmp_path).symptom_embeddings()
+    assert len(embed_calls) == 2
+
+
+@pytest.mark.parametrize("threshold, expected", [
+    (0.8, [TARGET_ISSUE]),  # Similarity equal to the threshold matches
+    (0.81, []),             # Just below the threshold does not
+])
+def test_similarity_threshold_boundary(tmp_path, embed_calls, threshold, expected):
+    kb = _kb(tmp_path, threshold=threshold)
+    matched = [view["issue_id"] for view in kb.query_for_planner([OBSERVED])]
+    assert matched == expected
+
+
+def test_keyword_matching_only_without_embeddings(embed_calls):
+    assert KnowledgeBase().query_for_planner([OBSERVED]) == []
+    assert embed_calls == []
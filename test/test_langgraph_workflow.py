@@ -0,0 +1,83 @@
+"""Tests for RehostingWorkflow configuration and action log writer lifecycle."""
+
+import configparser
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("langgraph")
+pytest.importorskip("pydantic")
+pytest.importorskip("ollama")
+
+from src.rehosting.graph.async_writer import AsyncActionWriter
+from src.rehosting.graph.langgraph_workflow import RehostingWorkflow, WorkflowConfig
+
+
+class _RecordingApp:
+    """Stand-in for the compiled graph: logs one action per run, optionally then fails."""
+
+    def __init__(self, workflow, fail=False):
+        self.workflow = workflow
+        self.fail = fail
+        self.runs = 0
+
+    async def ainvoke(self, state):
+        self.runs += 1
+        self.workflow.action_writer.write({"step_id": str(self.runs)})
+        if self.fail:
+            raise RuntimeError("graph failed")
+        return state
+
+
+@pytest.fixture
+def make_workflow(tmp_path):
+    def make(**kwargs):
+        workflow = RehostingWorkflow(WorkflowConfig(warmup=False, kb_enabled=False), tmp_path, **kwargs)
+        workflow.app = _RecordingApp(workflow)
+        return workflow
+    return make
+
+
+def _step_ids(path):
+    return [json.loads(line)["step_id"] for line in path.read_text().splitlines()]
+
+
+def test_shared_writer_is_flushed_per_run_and_left_open(tmp_path, make_workflow):
+    writer = AsyncActionWriter(tmp_path / "shared.jsonl")
+    try:
+        for expected in (["1"], ["1", "1"]):
+            workflow = make_workflow(action_writer=writer)
+            assert workflow.action_log_path == writer.path
+            workflow.run("fw.bin", {})
+            # Records are on disk when run() returns; the writer is still usable
+            assert _step_ids(writer.path) == expected
+            assert workflow.action_writer is writer
+            assert writer._thread.is_alive()
+    finally:
+        writer.close()
+
+
+def test_own_writer_is_closed_even_if_the_graph_fails(tmp_path, make_workflow):
+    workflow = make_workflow()
+    workflow.app.fail = True
+
+    with pytest.raises(RuntimeError, match="graph failed"):
+        workflow.run("fw.bin", {})
+
+    assert workflow.action_writer is None
+    assert _step_ids(tmp_path / "actions.jsonl") == ["1"]
+
+
+def test_workflow_config_defaults_and_overrides():
+    assert WorkflowConfig.from_configparser(configparser.ConfigParser()) == WorkflowConfig()
+
+    config = configparser.ConfigParser()
+    config.read_string("[Ollama]\nmodel = m\n[Engineer]\nmax_options = 5\n[Cache]\nenabled = true\n")
+    parsed = WorkflowConfig.from_configparser(config)
+    assert (parsed.model, parsed.max_options, parsed.cache_enabled, parsed.keep_alive) == ("m", 5, True, "30m")
+    assert not hasattr(parsed, "__dict__")
+
+    config.read_string("[Cache]\nresponses = true\nresponses_dir = /tmp/tinker-cache\nresponses_max_age = 60\n")
+    parsed = WorkflowConfig.from_configparser(config)
+    assert (parsed.response_cache_enabled, parsed.response_cache_dir, parsed.response_cache_max_age) == (True, Path("/tmp/tinker-cache"), 60.0)
@@ -0,0 +1,89 @@
+"""Tests for the planner result cache."""
+
+from src.rehosting.llm_cache import ResultCache, canonical_prompt, config_fingerprint
+from src.rehosting.schemas import ActionRecord, State
+
+
+def _state(**overrides):
+    fields = dict(
+        goal="Fix boot",
+        rag_context={"console": "panic: no init", "env": "FOO=1"},
+        discovery_mode=False,
+        discovery_variable=None,
+        previous_actions=[],
+        previous_engineer_summary=None,
+    )
+    fields.update(overrides)
+    return State(**fields)
+
+
+def _action(status="success"):
+    return ActionRecord(step_id="opt1", tool="set_env", input={"name": "FOO", "value": "1"},
+                        output_uri="config.yaml", summary="Set FOO", status=status)
+
+
+def test_key_stable_across_context_order():
+    a = _state(rag_context={"console": "x", "env": "y"})
+    b = _state(rag_context={"env": "y", "console": "x"})
+    assert canonical_prompt(a, "fp") == canonical_prompt(b, "fp")
+
+
+def test_key_changes_with_every_planner_input():
+    base = canonical_prompt(_state(), "fp")
+    variants = [
+        canonical_prompt(_state(goal="Other goal"), "fp"),
+        canonical_prompt(_state(rag_context={"console": "different"}), "fp"),
+        canonical_prompt(_state(discovery_mode=True), "fp"),
+        canonical_prompt(_state(discovery_variable="FOO"), "fp"),
+        canonical_prompt(_state(previous_actions=[_action()]), "fp"),
+        canonical_prompt(_state(previous_actions=[_action("failed")]), "fp"),
+        canonical_prompt(_state(previous_engineer_summary=[{"option": 1, "status": "success"}]), "fp"),
+        canonical_prompt(_state(), "other-fp"),
+    ]
+    assert base not in variants
+    assert len(set(variants)) == len(variants)
+
+
+def test_config_fingerprint_tracks_config_yaml(tmp_path):
+    assert config_fingerprint(None) == ""
+    assert config_fingerprint(str(tmp_path)) == ""
+
+    config = tmp_path / "config.yaml"
+    config.write_text("env: {}\n")
+    first = config_fingerprint(str(tmp_path))
+    assert first and first == config_fingerprint(str(tmp_path))
+
+    config.write_text("env: {FOO: '1'}\n")
+    assert config_fingerprint(str(tmp_path)) != first
+
+
+def test_hit_and_miss():
+    cache = ResultCache()
+    key = cache.exact_key(canonical_prompt(_state(), "fp"), "planner:m")
+    assert cache.get(key) is None
+
+    cache.put(key, {"plan": {"options": [1, 2]}})
+    assert cache.get(key) == {"plan": {"options": [1, 2]}}
+
+    # Same input under another model namespace, or a changed input, misses
+    assert cache.get(cache.exact_key(canonical_prompt(_state(), "fp"), "planner:other")) is None
+    assert cache.get(cache.exact_key(canonical_prompt(_state(discovery_mode=True), "fp"), "planner:m")) is None
+
+
+def test_hits_are_independent_copies():
+    cache = ResultCache()
+    updates = {"plan": {"options": [1, 2]}}
+    cache.put("k", updates)
+    updates["plan"]["options"].append(3)
+
+    hit = cache.get("k")
+    hit["plan"]["options"].clear()
+    assert cache.get("k") == {"plan": {"options": [1, 2]}}
+
+
+def test_evicts_oldest_entry():
+    cache = ResultCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+    assert cache.get("a") is None
+    assert cache.get("b") == "b" and cache.get("c") == "c"
@@ -0,0 +1,192 @@
+"""Tests for FirmwarePlannerAgent prompt handling and event-loop use."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("ollama")
+
+from src.rehosting.agents.planner import FirmwarePlannerAgent, _JsonObjectTracker
+from src.rehosting.schemas import State
+
+
+class _Stream:
+    def __init__(self, texts, done_reason="stop"):
+        self._texts = list(texts)
+        self._done_reason = done_reason
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._texts:
+            raise StopAsyncIteration
+        chunk = {"message": {"content": self._texts.pop(0)}}
+        if not self._texts:
+            chunk.update(done=True, done_reason=self._done_reason)
+        return chunk
+
+    async def aclose(self):
+        pass
+
+
+class _FakeClient:
+    """AsyncClient stand-in that records requests and streams a fixed response."""
+
+    def __init__(self, response='{"id": "p", "options": []}', done_reason="stop"):
+        self.response = response
+        self.done_reason = done_reason
+        self.requests = []
+
+    async def chat(self, **kwargs):
+        self.requests.append(kwargs)
+        return _Stream([self.response], self.done_reason)
+
+
+@pytest.fixture
+def planner():
+    return FirmwarePlannerAgent(kb_path=None)
+
+
+def _user_prompt(client):
+    return client.requests[-1]["messages"][-1]["content"]
+
+
+def test_speculative_retry_prompt_has_no_error_preamble(planner):
+    client = _FakeClient()
+    asyncio.run(planner._call_llm(client, "USER PROMPT", is_retry=True, previous_error=None))
+
+    prompt = _user_prompt(client)
+    assert prompt.startswith("USER PROMPT")
+    assert "Previous attempt failed" not in prompt
+    assert client.requests[-1]["options"]["temperature"] == 0.3
+
+
+def test_retry_prompt_includes_previous_error(planner):
+    client = _FakeClient()
+    asyncio.run(planner._call_llm(client, "USER PROMPT", is_retry=True, previous_error="bad json"))
+
+    assert _user_prompt(client).startswith("Previous attempt failed with error: bad json\n\nUSER PROMPT")
+
+
+def test_first_attempt_keeps_sampling_temperature(planner):
+    client = _FakeClient()
+    asyncio.run(planner._call_llm(client, "USER PROMPT"))
+
+    assert client.requests[-1]["options"]["temperature"] == 0.7
+
+
+def test_response_cache_reuses_responses_across_planners(tmp_path):
+    first = FirmwarePlannerAgent(kb_path=None, cache=True, cache_dir=tmp_path)
+    client = _FakeClient()
+    response = asyncio.run(first._call_llm(client, "USER PROMPT"))
+
+    assert client.requests[-1]["options"]["temperature"] == 0
+    assert [p.suffix for p in tmp_path.iterdir()] == [".json"]
+
+    # A new planner (e.g. the next workflow run) answers from disk without calling the LLM
+    second = FirmwarePlannerAgent(kb_path=None, cache=True, cache_dir=tmp_path)
+    other_client = _FakeClient('{"id": "other", "options": []}')
+    assert asyncio.run(second._call_llm(other_client, "USER PROMPT")) == response
+    assert other_client.requests == []
+
+    # Different messages miss the cache
+    asyncio.run(second._call_llm(other_client, "OTHER PROMPT"))
+    assert len(other_client.requests) == 1
+
+
+def test_response_cache_ignores_stale_entries(tmp_path):
+    planner = FirmwarePlannerAgent(kb_path=None, cache=True, cache_dir=tmp_path, cache_max_age=0)
+    asyncio.run(planner._call_llm(_FakeClient(), "USER PROMPT"))
+
+    client = _FakeClient()
+    asyncio.run(planner._call_llm(client, "USER PROMPT"))
+    assert len(client.requests) == 1
+
+
+def test_plan_rejects_running_event_loop(planner):
+    async def call_sync_plan():
+        planner.plan(State(goal="g"))
+
+    with pytest.raises(RuntimeError, match="acall"):
+        asyncio.run(call_sync_plan())
+
+
+def test_failed_speculative_attempt_lets_the_other_attempt_win(planner, monkeypatch):
+    from ollama import ResponseError
+
+    async def fake_call_llm(client, user_prompt, is_retry=False, previous_error=None, state=None):
+        if is_retry:
+            raise ResponseError("model runner crashed", 500)
+        await asyncio.sleep(0.05)  # The speculative attempt fails first
+        return '{"id": "fw_plan_1", "objectives": ["boot"], "options": []}'
+
+    async def no_context(state):
+        return ""
+    monkeypatch.setattr(planner, "_call_llm", fake_call_llm)
+    monkeypatch.setattr(planner, "_build_context", no_context)
+
+    assert planner.plan(State(goal="g")).id == "fw_plan_1"
+
+
+def test_request_errors_fall_back_to_placeholder_plan(planner, monkeypatch):
+    import httpx
+
+    async def fake_call_llm(client, user_prompt, is_retry=False, previous_error=None, state=None):
+        raise httpx.ConnectError("connection refused")
+
+    async def no_context(state):
+        return ""
+    monkeypatch.setattr(planner, "_call_llm", fake_call_llm)
+    monkeypatch.setattr(planner, "_build_context", no_context)
+    monkeypatch.setattr(planner, "_create_fallback_plan", lambda error, response: error)
+
+    assert planner.plan(State(goal="g")) == "connection refused"
+
+
+def _feed_all(chunks):
+    """Feed chunks to a tracker; return the index of the chunk that closed the object, or None."""
+    tracker = _JsonObjectTracker()
+    for i, chunk in enumerate(chunks):
+        if tracker.feed(chunk):
+            return i
+    return None
+
+
+@pytest.mark.parametrize("chunks, closed_at", [
+    (['{"a": 1}'], 0),
+    (['{"a": {"b": {', '"c": []}}', '}'], 2),                 # Nested objects
+    (['{"msg": "}}}"', ', "x": "{"}'], 1),                    # Braces inside strings
+    (['{"msg": "say \\"}\\" now"}'], 0),                      # Escaped quotes inside strings
+    (['{"msg": "ends with \\\\"', '}'], 1),                   # Escaped backslash before the closing quote
+    (['{"msg": "split \\', '"} still string"', '}'], 2),      # Escape split across chunks
+    (['  \n{', '"a": 1', '}\n  trailing'], 2),                # Leading whitespace before the object
+    (['{"options": [{"id": 1}, {"id": 2'], None),             # Truncated stream
+    (['{"msg": "unterminated }'], None),                      # Truncated inside a string
+])
+def test_json_object_tracker(chunks, closed_at):
+    assert _feed_all(chunks) == closed_at
+
+
+def test_stream_chat_stops_at_closing_brace(planner):
+    client = _FakeClient()
+    client.response = '{"id": "p"}'
+    assert asyncio.run(planner._stream_chat(client, [], {})) == ('{"id": "p"}', True, False)
+
+    client.response = '{"id": "p", "options": ['
+    client.done_reason = "length"
+    assert asyncio.run(planner._stream_chat(client, [], {})) == ('{"id": "p", "options": [', False, True)
+
+
+@pytest.mark.parametrize("response, done_reason, calls", [
+    ('{"id": "p", "options": [', "length", 2),   # Cut off by num_predict: retry with the full budget
+    ('{"id": "p", "options": [', "stop", 1),     # Stopped early for another reason
+    ("I cannot help with that.", "length", 1),   # Prose never opened an object
+])
+def test_call_llm_escalates_only_on_truncated_object(planner, response, done_reason, calls):
+    client = _FakeClient(response, done_reason)
+    assert asyncio.run(planner._call_llm(client, "USER PROMPT")) == response
+
+    assert len(client.requests) == calls
+    assert client.requests[-1]["options"]["num_predict"] == (planner.MAX_NUM_PREDICT if calls == 2 else 1024)
@@ -0,0 +1,51 @@
+"""Tests for rehosting_workflow helpers."""
+
+import re
+
+import pytest
+
+# rehosting_workflow imports the workflow graph at module level
+pytest.importorskip("langgraph")
+pytest.importorskip("pydantic")
+pytest.importorskip("ollama")
+
+from src.rehosting.rehosting_workflow import _strip_ansi
+
+# Regex the hand-written scanner replaced (SGR color codes only)
+_OLD_SGR_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+ESC = "\x1b"
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "plain text without escapes",
+    f"{ESC}[0m",
+    f"{ESC}[1;31merror{ESC}[0m: boot failed",
+    f"{ESC}[mreset only",
+    f"line1\n{ESC}[32mOK{ESC}[0m\nline3",
+    f"{ESC}[38;5;208morange{ESC}[39m and {ESC}[48;2;10;20;30mrgb{ESC}[0m",
+])
+def test_strip_ansi_matches_old_regex_for_sgr(text):
+    assert _strip_ansi(text) == _OLD_SGR_RE.sub('', text)
+
+
+@pytest.mark.parametrize("text, expected", [
+    (f"{ESC}[2Kcleared", "cleared"),                               # CSI erase line
+    (f"a{ESC}[10;20Hb", "ab"),                                     # CSI cursor position with params
+    (f"{ESC}[?25lhidden cursor{ESC}[?25h", "hidden cursor"),       # CSI private mode
+    (f"{ESC}]0;window title\x07after", "after"),                   # OSC ended by BEL
+    (f"{ESC}]8;;http://x\x1b\\link{ESC}]8;;\x1b\\", "link"),       # OSC ended by ST
+    (f"{ESC}]0;never ended", ""),                                  # Unterminated OSC runs to the end
+    (f"{ESC}7saved{ESC}8", "saved"),                               # Two-character escapes
+    (f"{ESC}[", ""),                                               # Truncated CSI
+    (f"trailing{ESC}", "trailing"),                                # Lone trailing ESC
+    (f"{ESC}{ESC}[31mx", "[31mx"),                                 # ESC ESC is one two-character escape
+])
+def test_strip_ansi_other_sequences(text, expected):
+    assert _strip_ansi(text) == expected
+
+
+def test_strip_ansi_returns_input_without_escapes():
+    text = "no escapes here\n" * 10
+    assert _strip_ansi(text) is text
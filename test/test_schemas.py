@@ -0,0 +1,47 @@
+"""Tests for the rehosting schema dataclasses."""
+
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
+from src.rehosting.schemas import ActionRecord, State
+
+
+def _record():
+    return ActionRecord(step_id="1", tool="set_env", input={"name": "FOO", "value": "1"},
+                        output_uri="config.yaml", summary="Set FOO", status="success")
+
+
+@pytest.mark.parametrize("clone", [
+    copy.copy,
+    copy.deepcopy,
+    lambda record: pickle.loads(pickle.dumps(record)),
+])
+def test_action_record_copy_and_pickle_round_trip(clone):
+    record = _record()
+    cloned = clone(record)
+    assert cloned == record
+    assert cloned.to_dict() == record.to_dict()
+
+
+def test_action_record_is_frozen_and_slotted():
+    record = _record()
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.status = "failed"
+
+
+def test_deepcopy_does_not_share_input():
+    record = _record()
+    cloned = copy.deepcopy(record)
+    cloned.input["value"] = "2"
+    assert record.input["value"] == "1"
+
+
+def test_state_is_slotted_and_round_trips():
+    state = State(goal="g", rag_context={"console": "x"}, previous_actions=[_record()])
+    assert not hasattr(state, "__dict__")
+    assert pickle.loads(pickle.dumps(state)) == state
+    assert copy.deepcopy(state) == state
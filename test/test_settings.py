@@ -0,0 +1,27 @@
+"""Tests for the shared logging helper in settings."""
+
+import logging
+
+from src.settings import configure_logger, set_verbose
+
+
+def test_configure_logger_adds_one_handler_and_tracks_verbose(capsys):
+    logger = logging.getLogger("tinker.test.configure_logger")
+
+    configure_logger(logger, "[TEST]", verbose=False)
+    configure_logger(logger, "[TEST]", verbose=False)
+    assert len(logger.handlers) == 1
+    assert not logger.propagate
+
+    logger.debug("hidden")
+    logger.info("shown")
+    assert capsys.readouterr().out == "[TEST] shown\n"
+
+    try:
+        set_verbose(True)
+        configure_logger(logger, "[TEST]")
+        assert logger.level == logging.DEBUG
+    finally:
+        set_verbose(False)
+    configure_logger(logger, "[TEST]")
+    assert logger.level == logging.INFO